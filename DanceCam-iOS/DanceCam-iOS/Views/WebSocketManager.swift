@@ -68,6 +68,18 @@ class WebSocketManager: ObservableObject {
         else if type == "host_pairDisconnect" {
             DispatchQueue.main.async { self.state = .connected }
         }
+        else if type == "client_message",
+                let envelope = json["data"] as? [String: Any],
+                let payload = envelope["data"] as? [String: Any],
+                payload["type"] as? String == "ping" {
+            // Echo the robot's clock probe with our receive and send times
+            let received = Date().timeIntervalSince1970
+            var pong = payload
+            pong["type"] = "pong"
+            pong["t1"] = received
+            pong["t2"] = Date().timeIntervalSince1970
+            send(message: ["type": "client_message", "data": pong])
+        }
     }
     
     func pair(with robotID: String) {
@@ -88,12 +100,12 @@ class WebSocketManager: ObservableObject {
     }
     
     func sendMove(duty1: Int, duty2: Int, duty3: Int, duty4: Int) {
-        let msg: [String: Any] = ["type": "client_message", "data": ["duty1": duty1, "duty2": duty2, "duty3": duty3, "duty4": duty4]]
+        let msg: [String: Any] = ["type": "client_message", "data": ["duty1": duty1, "duty2": duty2, "duty3": duty3, "duty4": duty4, "ts": Date().timeIntervalSince1970]]
         send(message: msg)
     }
     
     func sendStop() {
-        let msg: [String: Any] = ["type": "client_message", "data": ["stop": true]]
+        let msg: [String: Any] = ["type": "client_message", "data": ["stop": true, "ts": Date().timeIntervalSince1970]]
         send(message: msg)
     }
     
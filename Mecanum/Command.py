@@ -0,0 +1,15 @@
+class COMMAND:
+    CMD_MOTOR = "CMD_MOTOR"
+    CMD_M_MOTOR = "CMD_M_MOTOR"
+    CMD_CAR_ROTATE = "CMD_CAR_ROTATE"
+    CMD_LED = "CMD_LED"
+    CMD_LED_MOD = "CMD_LED_MOD"
+    CMD_SERVO = "CMD_SERVO"
+    CMD_BUZZER = "CMD_BUZZER"
+    CMD_SONIC = "CMD_SONIC"
+    CMD_LIGHT = "CMD_LIGHT"
+    CMD_POWER = "CMD_POWER" 
+    CMD_MODE ="CMD_MODE"
+    CMD_TELEMETRY = "CMD_TELEMETRY"
+    def __init__(self):
+        pass
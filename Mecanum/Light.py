@@ -0,0 +1,44 @@
+import time
+from Motor import *
+from ADC import *
+from hardware import hardware
+from modes import ModeRuntime
+
+class Light:
+    rate = 50  # steps per second under ModeRuntime
+
+    def __init__(self, motor=None):
+        self.PWM = motor if motor is not None else Motor()
+
+    def begin(self):
+        self.adc=hardware.sampler()
+        self.PWM.setMotorModel(0,0,0,0)
+
+    def step(self):
+        L = self.adc.recvADC(0)
+        R = self.adc.recvADC(1)
+        if L < 2.99 and R < 2.99 :
+            self.PWM.setMotorModel(600,600,600,600)
+        elif abs(L-R)<0.15:
+            self.PWM.setMotorModel(0,0,0,0)
+
+        elif L > 3 or R > 3:
+            if L > R :
+                self.PWM.setMotorModel(-1200,-1200,1400,1400)
+
+            elif R > L :
+                self.PWM.setMotorModel(1400,1400,-1200,-1200)
+
+    def run(self):
+        """Follows the light until Ctrl+C"""
+        ModeRuntime(self.PWM).run('light', self)
+
+if __name__=='__main__':
+    print ('Program is starting ... ')
+    led_Car=Light()
+    led_Car.run()
+
+
+        
+    
+
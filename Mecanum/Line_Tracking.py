@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import deque
+from Motor import *
+import RPi.GPIO as GPIO
+from modes import ModeRuntime
+
+# Wheel duties for each sensor pattern, left sensor in the highest bit.
+# None leaves the wheels as they are: no line seen, or the two outer sensors only.
+DUTIES = (None,
+          (2500,2500,-1500,-1500),    # 001 right
+          (800,800,800,800),          # 010 middle
+          (4000,4000,-2000,-2000),    # 011 middle and right
+          (-1500,-1500,2500,2500),    # 100 left
+          None,                       # 101
+          (-2000,-2000,4000,4000),    # 110 left and middle
+          (0,0,0,0))                  # 111 crossing, stop
+
+class Line_Tracking:
+    """Follows a line from edges on the three IR sensors.
+
+    Under ModeRuntime a sensor edge wakes the mode, which reads the pattern
+    once the sensors have been still for debounce seconds, or after 1/rate
+    seconds of chatter, and commands the motors only if the pattern changed. With no edges it re-reads every
+    1/rate seconds in case one was missed. latencies holds the ns from the
+    first edge of a change to the motor command.
+    """
+    rate = 10  # steps per second with no edges
+    def __init__(self, motor=None, debounce=0.002):
+        self.PWM = motor if motor is not None else Motor()
+        self.IR01 = 14
+        self.IR02 = 15
+        self.IR03 = 23
+        self.debounce_ns = int(debounce * 1e9)
+        self.wakeup = threading.Event()
+        self.edge_ns = 0  # last edge on any sensor
+        self.first_edge_ns = None  # first edge since the pattern was last read
+        self.LMR = None
+        self.updates = 0  # motor commands sent
+        self.latencies = deque(maxlen=1000)
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(self.IR01,GPIO.IN)
+        GPIO.setup(self.IR02,GPIO.IN)
+        GPIO.setup(self.IR03,GPIO.IN)
+    def edge(self, pin):
+        now = time.monotonic_ns()
+        if self.first_edge_ns is None:
+            self.first_edge_ns = now
+        self.edge_ns = now
+        self.wakeup.set()
+    def read(self):
+        return (GPIO.input(self.IR01) << 2 | GPIO.input(self.IR02) << 1 | GPIO.input(self.IR03))
+    def begin(self):
+        self.LMR = None
+        for pin in (self.IR01, self.IR02, self.IR03):
+            GPIO.add_event_detect(pin, GPIO.BOTH, callback=self.edge)
+    def step(self):
+        # Sensor chatter keeps moving edge_ns, so give up waiting after one step period
+        give_up_ns = time.monotonic_ns() + int(1e9 / self.rate)
+        while True:
+            wait = min(self.edge_ns + self.debounce_ns, give_up_ns) - time.monotonic_ns()
+            if wait <= 0:
+                break
+            time.sleep(wait / 1e9)
+        first = self.first_edge_ns
+        self.first_edge_ns = None
+        LMR = self.read()
+        if LMR == self.LMR:
+            return
+        self.LMR = LMR
+        duties = DUTIES[LMR]
+        if duties is not None:
+            self.PWM.setMotorModel(*duties)
+            self.updates += 1
+            if first is not None:
+                self.latencies.append(time.monotonic_ns() - first)
+    def end(self):
+        for pin in (self.IR01, self.IR02, self.IR03):
+            GPIO.remove_event_detect(pin)
+    def run(self):
+        ModeRuntime(self.PWM).run('line', self)
+
+infrared=Line_Tracking()
+# Main program logic follows:
+if __name__ == '__main__':
+    print ('Program is starting ... ')
+    try:
+        infrared.run()
+    except KeyboardInterrupt:  # When 'Ctrl+C' is pressed, the child program  will be  executed.
+        PWM.setMotorModel(0,0,0,0)
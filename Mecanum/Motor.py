@@ -0,0 +1,100 @@
+import math
+import numpy as np
+from PCA9685 import PCA9685
+from ADC import *
+from hardware import hardware
+import kinematics
+import time
+
+
+class Motor:
+    def __init__(self):
+        self.time_proportion = 2.5  # Depend on your own car,If you want to get the best out of the rotation mode,
+        # change the value by experimenting.
+        self.deadband = 0  # duty changes this small are dropped by setMotorModel, 0 applies every change
+
+    @property
+    def pwm(self):
+        return hardware.pwm()
+
+    @property
+    def adc(self):
+        return hardware.sampler()
+
+    @staticmethod
+    def wheel_duty(duty):
+        """Returns the (forward, backward) channel duties for one wheel, braking at 0"""
+        if duty > 0:
+            return duty, 0
+        elif duty < 0:
+            return 0, abs(duty)
+        else:
+            return 4095, 4095
+
+    def left_Upper_Wheel(self, duty):
+        fwd, bwd = self.wheel_duty(duty)
+        self.pwm.setMotorPwms(0, (bwd, fwd))
+
+    def left_Lower_Wheel(self, duty):
+        fwd, bwd = self.wheel_duty(duty)
+        self.pwm.setMotorPwms(2, (fwd, bwd))
+
+    def right_Upper_Wheel(self, duty):
+        fwd, bwd = self.wheel_duty(duty)
+        self.pwm.setMotorPwms(6, (bwd, fwd))
+
+    def right_Lower_Wheel(self, duty):
+        fwd, bwd = self.wheel_duty(duty)
+        self.pwm.setMotorPwms(4, (bwd, fwd))
+
+    def setMotorModel(self, duty1, duty2, duty3, duty4):
+        # Scaled down together, so an oversized command keeps its direction
+        duty1, duty2, duty3, duty4 = kinematics.saturate_wheels(duty1, duty2, duty3, duty4)
+        lu_fwd, lu_bwd = self.wheel_duty(duty1)
+        ll_fwd, ll_bwd = self.wheel_duty(duty2)
+        ru_fwd, ru_bwd = self.wheel_duty(duty3)
+        rl_fwd, rl_bwd = self.wheel_duty(duty4)
+        # Channels 0-7 in register order, so all four wheels go out in one block write
+        try:
+            self.pwm.setMotorPwms(0, (lu_bwd, lu_fwd, ll_fwd, ll_bwd, rl_bwd, rl_fwd, ru_bwd, ru_fwd), self.deadband)
+        except OSError:
+            hardware.fault('pwm')  # reopened on the next command
+            raise
+
+    def Rotate(self, n, output=None):
+        """Spins while translating toward angle n, sending commands to output (default: this motor)"""
+        output = output if output is not None else self
+        bat_compensate = 7.5 / (self.adc.recvADC(2) * 3)
+        # One full turn of the heading in 5 degree steps, mixed in a single call
+        wheels = kinematics.joystick(np.arange(n, n - 360, -5), 2000, 90, 2000).tolist()
+        while True:
+            for FL, BL, FR, BR in wheels:
+                output.setMotorModel(FL, BL, FR, BR)
+                print("rotating")
+                time.sleep(5 * self.time_proportion * bat_compensate / 1000)
+
+
+PWM = Motor()
+
+
+def loop():
+    PWM.setMotorModel(2000, 2000, 2000, 2000)  # Forward
+    time.sleep(3)
+    PWM.setMotorModel(-2000, -2000, -2000, -2000)  # Back
+    time.sleep(3)
+    PWM.setMotorModel(-500, -500, 2000, 2000)  # Left
+    time.sleep(3)
+    PWM.setMotorModel(2000, 2000, -500, -500)  # Right
+    time.sleep(3)
+    PWM.setMotorModel(0, 0, 0, 0)  # Stop
+
+
+def destroy():
+    PWM.setMotorModel(0, 0, 0, 0)
+
+
+if __name__ == '__main__':
+    try:
+        loop()
+    except KeyboardInterrupt:  # When 'Ctrl+C' is pressed, the child program destroy() will be  executed.
+        destroy()
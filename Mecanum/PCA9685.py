@@ -0,0 +1,147 @@
+#!/usr/bin/python
+
+import time
+import math
+import smbus
+import threading
+
+# ============================================================================
+# Raspi PCA9685 16-Channel PWM Servo Driver
+# ============================================================================
+
+class PCA9685:
+
+  # Registers/etc.
+  __SUBADR1            = 0x02
+  __SUBADR2            = 0x03
+  __SUBADR3            = 0x04
+  __MODE1              = 0x00
+  __PRESCALE           = 0xFE
+  __LED0_ON_L          = 0x06
+  __LED0_ON_H          = 0x07
+  __LED0_OFF_L         = 0x08
+  __LED0_OFF_H         = 0x09
+  __ALLLED_ON_L        = 0xFA
+  __ALLLED_ON_H        = 0xFB
+  __ALLLED_OFF_L       = 0xFC
+  __ALLLED_OFF_H       = 0xFD
+  __MODE1_AI           = 0x20      # register auto-increment
+  __BLOCK_MAX          = 32        # SMBus block write limit, 8 channels
+
+  __BLOCK_GAP          = 3         # clean bytes worth rewriting to save a transaction
+
+  def __init__(self, address=0x40, debug=False, lock=None):
+    self.bus = smbus.SMBus(1)
+    self.address = address
+    self.debug = debug
+    self.lock = lock or threading.RLock()  # one driver is shared by every thread, see hardware.py
+    self.invalidate()
+    self.write(self.__MODE1, self.__MODE1_AI)
+
+  def invalidate(self):
+    "Forgets the register shadow so every register is rewritten, e.g. to resync after a bus error"
+    self.shadow = [None] * 256
+    
+  def write(self, reg, value, force=False):
+    "Writes an 8-bit value to the specified register/address, skipped if the shadow already holds it"
+    if not force and self.shadow[reg] == value:
+      return
+    try:
+      self.bus.write_byte_data(self.address, reg, value)
+    except OSError:
+      self.invalidate()
+      raise
+    self.shadow[reg] = value
+
+  def writeBlock(self, reg, data):
+    "Writes the bytes of data that differ from the shadow, starting at reg, as auto-increment block writes"
+    shadow = self.shadow
+    n = len(data)
+    i = 0
+    while i < n:
+      if shadow[reg+i] == data[i]:
+        i += 1
+        continue
+      # Extend the dirty run, swallowing short clean gaps that cost less than a new transaction
+      start = end = i
+      i += 1
+      while i < n and i - start < self.__BLOCK_MAX:
+        if shadow[reg+i] != data[i]:
+          end = i
+        elif i - end > self.__BLOCK_GAP:
+          break
+        i += 1
+      try:
+        self.bus.write_i2c_block_data(self.address, reg+start, data[start:end+1])
+      except OSError:
+        self.invalidate()
+        raise
+      shadow[reg+start:reg+end+1] = data[start:end+1]
+      i = end + 1
+      
+  def read(self, reg):
+    "Read an unsigned byte from the I2C device"
+    result = self.bus.read_byte_data(self.address, reg)
+    self.shadow[reg] = result
+    return result
+    
+  def setPWMFreq(self, freq):
+    "Sets the PWM frequency"
+    prescaleval = 25000000.0    # 25MHz
+    prescaleval /= 4096.0       # 12-bit
+    prescaleval /= float(freq)
+    prescaleval -= 1.0
+    prescale = math.floor(prescaleval + 0.5)
+    if self.shadow[self.__PRESCALE] == int(math.floor(prescale)):
+      return                                 # already running at this frequency
+
+
+    with self.lock:
+      oldmode = self.read(self.__MODE1);
+      newmode = (oldmode & 0x7F) | 0x10        # sleep
+      self.write(self.__MODE1, newmode)        # go to sleep
+      self.write(self.__PRESCALE, int(math.floor(prescale)))
+      self.write(self.__MODE1, oldmode)
+      time.sleep(0.005)
+      self.write(self.__MODE1, oldmode | 0x80, force=True)
+
+  def setPWM(self, channel, on, off):
+    "Sets a single PWM channel"
+    with self.lock:
+      self.write(self.__LED0_ON_L+4*channel, on & 0xFF)
+      self.write(self.__LED0_ON_H+4*channel, on >> 8)
+      self.write(self.__LED0_OFF_L+4*channel, off & 0xFF)
+      self.write(self.__LED0_OFF_H+4*channel, off >> 8)
+  def setPWMs(self, channel, values, deadband=0):
+    """Sets consecutive PWM channels from (on, off) pairs with auto-increment block writes.
+    Channels whose off count moved by no more than deadband keep their old value,
+    except when starting from or going to 0."""
+    with self.lock:
+      shadow = self.shadow
+      reg = self.__LED0_ON_L+4*channel
+      data = []
+      for i, (on, off) in enumerate(values):
+        if deadband and off:
+          r = reg + 4*i
+          old_on = shadow[r], shadow[r+1]
+          old_off = shadow[r+2], shadow[r+3]
+          if None not in old_on and None not in old_off:
+            old = old_off[0] | old_off[1] << 8
+            if old and (on & 0xFF, on >> 8) == old_on and abs(off - old) <= deadband:
+              off = old
+        data += [on & 0xFF, on >> 8, off & 0xFF, off >> 8]
+      self.writeBlock(reg, data)
+  def setMotorPwm(self,channel,duty):
+    self.setPWM(channel,0,duty)
+  def setMotorPwms(self, channel, duties, deadband=0):
+    "Sets consecutive motor channels, writing only the changed registers"
+    self.setPWMs(channel, [(0, duty) for duty in duties], deadband)
+  def setServoPulse(self, channel, pulse):
+    "Sets the Servo Pulse,The PWM frequency must be 50HZ"
+    pulse = pulse*4096/20000        #PWM frequency is 50HZ,the period is 20000us
+    self.setPWM(channel, 0, int(pulse))
+
+if __name__=='__main__':
+    pass
+    
+      
@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import deque
+from Motor import *
+import RPi.GPIO as GPIO
+from servo import *
+from PCA9685 import PCA9685
+from modes import ModeRuntime
+from scanner import SweepScanner
+from scheduler import Periodic
+
+
+class Ultrasonic(Periodic):
+    """HC-SR04 on a servo.
+
+    start() ranges in the background: a thread pings every interval
+    seconds, far enough apart that one ping's echoes don't reach the next,
+    and GPIO callbacks timestamp the echo's edges with time.monotonic_ns().
+    Only edges inside the current ping's window count, paired in order:
+    the first is the echo's rise and the next its fall. Callbacks run late,
+    so the pin's level by then says nothing. The last `window` readings are
+    kept in a ring; get_distance() returns their median smoothed by an EMA
+    at once, or None once the newest is older than stale seconds, as it is
+    when pings keep timing out. No reading is not a clear path. Without
+    start(), get_distance() pings and busy-waits as before.
+
+    As a mode it avoids obstacles while a SweepScanner sweeps the sensor.
+    """
+    def __init__(self, motor=None, interval=0.03, window=5, alpha=0.5, stale=0.2):
+        self.PWM = motor if motor is not None else Motor()
+        GPIO.setwarnings(False)
+        self.trigger_pin = 27
+        self.echo_pin = 22
+        self.MAX_DISTANCE = 300  # define the maximum measuring distance, unit: cm
+        self.timeOut = self.MAX_DISTANCE * 60  # calculate timeout according to the maximum measuring distance
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(self.trigger_pin, GPIO.OUT)
+        GPIO.setup(self.echo_pin, GPIO.IN)
+        self.period = interval
+        self.alpha = alpha  # weight of the newest median in the EMA
+        self.stale_ns = int(stale * 1e9)
+        self.readings = deque(maxlen=window)  # (monotonic_ns, cm) of recent echoes
+        self.filtered = None
+        self.pings = 0
+        self.timeouts = 0  # pings with no echo within MAX_DISTANCE
+        self.rise_ns = None
+        self.window_ns = None  # (first, last) monotonic_ns an edge of the current ping may have
+        self.echoed = threading.Event()
+
+    def pulseIn(self, pin, level, timeOut):  # obtain pulse time of a pin under timeOut
+        t0 = time.time()
+        while (GPIO.input(pin) != level):
+            if ((time.time() - t0) > timeOut * 0.000001):
+                return 0;
+        t0 = time.time()
+        while (GPIO.input(pin) == level):
+            if ((time.time() - t0) > timeOut * 0.000001):
+                return 0;
+        pulseTime = (time.time() - t0) * 1000000
+        return pulseTime
+
+    def start(self):
+        if self.thread is None:
+            GPIO.add_event_detect(self.echo_pin, GPIO.BOTH, callback=self.edge)
+        return super().start()
+
+    def stop(self):
+        started = self.thread is not None
+        super().stop()
+        if started:
+            GPIO.remove_event_detect(self.echo_pin)
+
+    def edge(self, pin):
+        now = time.monotonic_ns()
+        window = self.window_ns
+        if window is None or not window[0] <= now <= window[1]:
+            return  # a late echo of an earlier ping, or noise
+        if self.rise_ns is None:
+            self.rise_ns = now  # the ping's first edge is the echo's rise, the next its fall
+            return
+        cm = (now - self.rise_ns) * 340.0 / 2.0 / 1e7  # sound at 340m/s
+        self.rise_ns = None
+        self.window_ns = None  # one echo per ping
+        if cm <= self.MAX_DISTANCE:
+            if self.readings and now - self.readings[-1][0] > self.stale_ns:
+                self.readings.clear()  # don't smooth into readings from before a gap
+                self.filtered = None
+            self.readings.append((now, cm))
+            ordered = sorted(reading[1] for reading in self.readings)
+            median = ordered[len(ordered) // 2]
+            self.filtered = median if self.filtered is None else self.filtered + self.alpha * (median - self.filtered)
+        self.echoed.set()
+
+    def tick(self):
+        """One ping, waiting for its echo"""
+        self.rise_ns = None
+        self.echoed.clear()
+        start = time.monotonic_ns()
+        self.window_ns = (start, start + int((self.timeOut * 0.000001 + 0.002) * 1e9))
+        GPIO.output(self.trigger_pin, GPIO.HIGH)  # make trigger_pin output 10us HIGH level
+        time.sleep(0.00001)  # 10us
+        GPIO.output(self.trigger_pin, GPIO.LOW)
+        self.pings += 1
+        if not self.echoed.wait(self.timeOut * 0.000001 + 0.002):  # longest echo, and the sensor's delay
+            self.timeouts += 1
+            self.window_ns = None
+
+    def get_distance(self):  # get the measurement results of ultrasonic module,with unit: cm
+        if self.running:
+            if self.filtered is None or time.monotonic_ns() - self.readings[-1][0] > self.stale_ns:
+                return None  # nothing echoed lately: too close, too far, or a failing sensor
+            return int(self.filtered)
+        distance_cm = [0, 0, 0, 0, 0]
+        for i in range(5):
+            GPIO.output(self.trigger_pin, GPIO.HIGH)  # make trigger_pin output 10us HIGH level
+            time.sleep(0.00001)  # 10us
+            GPIO.output(self.trigger_pin, GPIO.LOW)  # make trigger_pin output LOW level
+            pingTime = self.pulseIn(self.echo_pin, GPIO.HIGH, self.timeOut)  # read plus time of echo_pin
+            distance_cm[i] = pingTime * 340.0 / 2.0 / 10000.0  # calculate distance with sound speed 340m/s
+        distance_cm = sorted(distance_cm)
+        return int(distance_cm[2])
+
+    def run_motor(self, L, M, R):
+        if (L < 30 and M < 30 and R < 30) or M < 30:
+            self.PWM.setMotorModel(-1000, -1000, -1000, -1000)
+            time.sleep(0.1)
+            if L < R:
+                self.PWM.setMotorModel(1000, 1000, -1000, -1000)
+            else:
+                self.PWM.setMotorModel(-1000, -1000, 1000, 1000)
+        elif L < 30 and M < 30:
+            self.PWM.setMotorModel(1500, 1500, -1500, -1500)
+        elif R < 30 and M < 30:
+            self.PWM.setMotorModel(-1500, -1500, 1500, 1500)
+        elif L < 20:
+            self.PWM.setMotorModel(1500, 1500, -500, -500)
+            if L < 10:
+                self.PWM.setMotorModel(1500, 1500, -1000, -1000)
+        elif R < 20:
+            self.PWM.setMotorModel(-500, -500, 1500, 1500)
+            if R < 10:
+                self.PWM.setMotorModel(-1000, -1000, 1000, 1000)
+        else:
+            self.PWM.setMotorModel(600, 600, 600, 600)
+
+    rate = 20  # steps per second under ModeRuntime
+
+    def begin(self):
+        self.ranging = not self.running  # started here, so stopped in end()
+        self.start()
+        self.pwm_S = Servo()
+        self.scanner = SweepScanner(self.pwm_S, self).start()
+
+    def step(self):
+        """Avoids obstacles from the sweep's polar map: the closest ranges to
+        the left, ahead and right, once the sweep has crossed them all. A
+        sector with no recent echo counts as blocked, so a silent sensor
+        backs the robot off instead of driving it on."""
+        if self.scanner.sweeps() < 1:
+            return
+        L, M, R = (0 if cm is None else cm for cm in self.scanner.sectors())
+        self.run_motor(L, M, R)
+
+    def end(self):
+        self.scanner.stop()  # centers the servo
+        if self.ranging:
+            self.stop()
+
+    def run(self):
+        ModeRuntime(self.PWM).run('ultrasonic', self)
+
+    def run0(self):
+        """The sweeping avoidance run() also does now"""
+        self.run()
+
+
+ultrasonic = Ultrasonic()
+# Main program logic follows:
+if __name__ == '__main__':
+    print('Program is starting ... ')
+    ultrasonic.run()  # Ctrl+C stops the motors and centers the servo
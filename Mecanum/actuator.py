@@ -0,0 +1,79 @@
+import itertools
+from scheduler import Periodic
+
+
+class Mailbox:
+    """Single-slot, last-writer-wins mailbox for one consumer.
+
+    put() replaces whatever is waiting and take() returns the newest value at
+    most once. Both sides only swap one attribute, which is atomic in CPython,
+    so producers never wait on a lock or on the consumer.
+    """
+
+    def __init__(self):
+        self._counter = itertools.count(1)
+        self._slot = (0, None)
+        self._seen = 0
+
+    def put(self, value):
+        self._slot = (next(self._counter), value)
+
+    def take(self):
+        """Returns the newest value not taken yet, or None"""
+        seq, value = self._slot
+        if seq <= self._seen:
+            return None
+        self._seen = seq
+        return value
+
+
+class Actuator(Periodic):
+    """Applies wheel setpoints to a Motor from one thread at a fixed rate.
+
+    setMotorModel() has the same signature as Motor.setMotorModel, so the
+    actuator can be handed to any producer in place of the Motor. Producers
+    only post into the mailbox; each tick the actuator applies the newest
+    setpoint, so the bus sees at most one write per tick and stale commands
+    are never written. A failed write is retried on the next tick.
+    """
+
+    def __init__(self, motor, rate=100, max_step=None):
+        self.motor = motor
+        self.period = 1.0 / rate
+        self.max_step = max_step  # largest duty change per wheel per tick, None for no limit
+        self.setpoints = Mailbox()
+        self.duties = None  # last applied duties
+        self.target = None
+
+    def setMotorModel(self, duty1, duty2, duty3, duty4):
+        self.setpoints.put((duty1, duty2, duty3, duty4))
+
+    def stop(self):
+        super().stop()
+        self.motor.setMotorModel(0, 0, 0, 0)
+        self.duties = (0, 0, 0, 0)
+
+    def step(self, target):
+        """Moves the applied duties toward target by at most max_step per wheel, stops are immediate"""
+        if not self.max_step or self.duties is None or not any(target):
+            return target
+        m = self.max_step
+        return tuple(duty + max(-m, min(m, goal - duty)) for duty, goal in zip(self.duties, target))
+
+    def tick(self):
+        target = self.setpoints.take()
+        if target is not None:
+            self.target = target
+        if self.target is None:
+            return
+        duties = self.step(self.target)
+        try:
+            if duties != self.duties:
+                self.motor.setMotorModel(*duties)
+        except OSError as e:
+            print("Motor write failed: " + str(e))
+            self.duties = None
+            return
+        self.duties = duties
+        if duties == self.target:
+            self.target = None
@@ -0,0 +1,853 @@
+import fake_hw
+GPIO = fake_hw.install()
+
+import asyncio
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import numpy as np
+from fake_hw import FakeSMBus
+from Motor import Motor
+from scheduler import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+PCA9685_ADDRESS = 0x40
+LED1_OFF_L = 0x0C  # channel 1, left upper wheel forward
+
+
+def count(fn, *args):
+    FakeSMBus.reset()
+    fn(*args)
+    return len(FakeSMBus.transactions)
+
+
+def bench_Motor():
+    PWM = Motor()
+    duties = (2000, -2000, 1500, -1500)
+
+    # Before: one setPWM per channel, four register writes each
+    PWM.pwm.invalidate()
+    FakeSMBus.reset()
+    for channel, duty in enumerate((0, 2000, 2000, 0, 0, 1500, 1500, 0)):
+        PWM.pwm.setMotorPwm(channel, duty)
+    before = len(FakeSMBus.transactions)
+
+    # After: all eight channels in one auto-increment block write
+    PWM.pwm.invalidate()
+    after = count(PWM.setMotorModel, *duties)
+    print("I2C transactions per setMotorModel: before %d, after %d" % (before, after))
+    assert after == 1, FakeSMBus.transactions
+
+    # Repeats and stops only touch the bus when a register changes
+    repeat = count(PWM.setMotorModel, *duties)
+    PWM.setMotorModel(0, 0, 0, 0)
+    stop = count(PWM.setMotorModel, 0, 0, 0, 0)
+    print("I2C transactions per repeated command: %d, repeated stop: %d" % (repeat, stop))
+    assert repeat == 0 and stop == 0, FakeSMBus.transactions
+
+    PWM.setMotorModel(*duties)
+    PWM.deadband = 16
+    small = count(PWM.setMotorModel, 2010, -1990, 1500, -1500)
+    PWM.deadband = 0
+    print("I2C transactions for a change inside the deadband: %d" % small)
+    assert small == 0, FakeSMBus.transactions
+
+    PWM.pwm.invalidate()
+    resync = count(PWM.setMotorModel, *duties)
+    print("I2C transactions after invalidate(): %d" % resync)
+    assert resync == 1, FakeSMBus.transactions
+
+
+# ---------------------------------------------------------------------------
+# Command-to-actuation suite. Every scenario is a pair of functions:
+# issue(value) sends one command that drives a watched register or pin to
+# value, and wait(value, after) blocks until the fake hardware holds value,
+# returning the perf_counter() of the write that put it there.
+# ---------------------------------------------------------------------------
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {'p%d' % p: round(percentile(ordered, p) * 1e6, 1) for p in (50, 95, 99)}
+
+
+def measure(issue, wait, values, n):
+    """Latency with one command in flight, then throughput with n commands back to back.
+    Latency samples start after a random idle gap so they don't lock step with
+    periodic consumers like the Actuator. I2C counts only the motor driver's
+    transactions, so ADC reads elsewhere on the bus stay out of them."""
+    FakeSMBus.reset()
+    GPIO.reset()
+    latencies = []
+    for i in range(n):
+        value = values(0, i)
+        time.sleep(random.uniform(0, 0.01))
+        start = time.perf_counter()
+        issue(value)
+        latencies.append(wait(value, start) - start)
+    i2c = sum(1 for op, address, reg, nbytes in FakeSMBus.transactions if address == PCA9685_ADDRESS)
+    gpio = len(GPIO.calls)
+
+    start = time.perf_counter()
+    for i in range(n):
+        last = time.perf_counter()
+        issue(values(1, i))
+    elapsed = wait(values(1, n - 1), last) - start
+    return {
+        'commands': n,
+        'throughput_cmd_s': round(n / elapsed, 1),
+        'i2c_per_command': round(i2c / n, 2),
+        'gpio_per_command': round(gpio / n, 2),
+        'latency_us': percentiles(latencies),
+    }
+
+
+def wheel_values(phase, i):
+    return 100 + 2000 * phase + i % 1900
+
+
+def wait_wheel(value, after):
+    return FakeSMBus.wait_word(PCA9685_ADDRESS, LED1_OFF_L, value, after)
+
+
+def load_motor_server():
+    spec = importlib.util.spec_from_file_location('motor_server_gpio', os.path.join(ROOT, 'motor-server.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def scenario_motor_server_http(n):
+    """motor-server.py /move through Flask's test client"""
+    server = load_motor_server()
+    client = server.app.test_client()
+    pin = server.motors['front_left']['pwm']
+    return measure(lambda speed: client.post('/move', json={'command': 'forward', 'speed': speed}),
+                   lambda speed, after: GPIO.wait_duty(pin, speed, after),
+                   lambda phase, i: 1 + 49 * phase + 48.0 * i / n, n)
+
+
+def scenario_motor_server_udp(n):
+    """motor-server.py commands over the binary UDP transport on loopback"""
+    from motor_udp import UdpControlServer, UdpControlClient
+    server = load_motor_server()
+    udp = UdpControlServer(lambda packet: server.run_command(packet.command, packet.speed),
+                           host='127.0.0.1', port=0).start()
+    client = UdpControlClient(*udp.address)
+    pin = server.motors['front_left']['pwm']
+    try:
+        return measure(lambda speed: client.send('forward', speed),
+                       lambda speed, after: GPIO.wait_duty(pin, speed, after),
+                       lambda phase, i: 1 + i % 100, n)
+    finally:
+        client.close()
+        udp.close()
+
+
+def scenario_mecanum_motor_server(n):
+    """Mecanum/motor_server.py /move through Flask's test client"""
+    import motor_server
+    client = motor_server.app.test_client()
+    return measure(lambda duty: client.post('/move', json={'duty1': duty, 'duty2': 0, 'duty3': 0, 'duty4': 0}),
+                   wait_wheel, wheel_values, n)
+
+
+def loopback_server():
+    from server import Server
+    server = Server()
+    server.StartTcpServer(host='127.0.0.1', control_port=0, video_port=0)
+    return server
+
+
+def scenario_server_control(n, binary=False):
+    """Server's control socket fed CMD_MOTOR commands over loopback TCP"""
+    import protocol
+    from hardware import hardware
+    server = loopback_server()
+    # Ranging and ADC sampling run in the background, not on the command path
+    server.ultrasonic.stop()
+    hardware.stop_sampler()
+    client = socket.create_connection(server.server_socket1.getsockname())
+    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if binary:
+        client.sendall(bytes([protocol.BINARY_HELLO]))
+        command = lambda duty: protocol.encode('CMD_MOTOR', duty, 0, 0, 0)
+    else:
+        command = lambda duty: b'CMD_MOTOR#%d#0#0#0\n' % duty
+    try:
+        return measure(lambda duty: client.sendall(command(duty)), wait_wheel, wheel_values, n)
+    finally:
+        client.close()
+        server.close()
+
+
+def scenario_robot_client(n):
+    """RobotClient.handle_message driving an Actuator, as motor_client.py does"""
+    from actuator import Actuator
+    from robotClient import RobotClient
+    PWM = Actuator(Motor(), rate=100).start()
+    robot = RobotClient('ws://bench', PWM.setMotorModel, lambda: PWM.setMotorModel(0, 0, 0, 0))
+    robot.paired_with = 'bench'
+    loop = asyncio.new_event_loop()
+
+    def issue(duty):
+        message = {'type': 'client_message',
+                   'data': {'type': 'client_message', 'data': {'duty1': duty, 'duty2': 0, 'duty3': 0, 'duty4': 0}}}
+        loop.run_until_complete(robot.handle_message(json.dumps(message)))
+    try:
+        return measure(issue, wait_wheel, wheel_values, n)
+    finally:
+        PWM.stop()
+        loop.close()
+
+
+scenarios = {
+    'motor-server.py http': scenario_motor_server_http,
+    'motor-server.py udp': scenario_motor_server_udp,
+    'Mecanum/motor_server.py': scenario_mecanum_motor_server,
+    'Server control': scenario_server_control,
+    'Server control binary': lambda n: scenario_server_control(n, binary=True),
+    'RobotClient': scenario_robot_client,
+}
+
+
+def bench_Suite(byte_cost_us=90.0, n=200):
+    """Runs every scenario and prints the results as JSON. byte_cost_us is the simulated
+    I2C time per byte, 90us is a 100kHz bus."""
+    FakeSMBus.byte_cost = byte_cost_us * 1e-6
+    results = {'byte_cost_us': byte_cost_us, 'scenarios': {}}
+    for name, scenario in scenarios.items():
+        with contextlib.redirect_stdout(io.StringIO()):  # the servers print every command
+            results['scenarios'][name] = scenario(n)
+    print(json.dumps(results, indent=2))
+
+
+def command_stream(n=20000, seed=1):
+    """A recorded-style session: mostly joystick updates, some LED, servo, power and mode commands"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n):
+        r = rng.random()
+        if r < 0.6:
+            lines.append('CMD_M_MOTOR#%d#%d#%d#%d' % (rng.randrange(360), rng.randrange(100), rng.randrange(360), rng.randrange(100)))
+        elif r < 0.85:
+            lines.append('CMD_MOTOR#%d#%d#%d#%d' % tuple(rng.randrange(-4095, 4096) for _ in range(4)))
+        elif r < 0.92:
+            lines.append('CMD_LED#%d#%d#%d#%d' % (rng.randrange(256), rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        elif r < 0.97:
+            lines.append('CMD_SERVO#%d#%d' % (rng.randrange(2), rng.randrange(180)))
+        elif r < 0.99:
+            lines.append('CMD_POWER')
+        else:
+            lines.append('CMD_MODE#one')
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def chunks(stream, largest=1448, seed=2):
+    """Splits stream at random points, like TCP segments"""
+    rng = random.Random(seed)
+    i = 0
+    out = []
+    while i < len(stream):
+        n = rng.randint(1, largest)
+        out.append(stream[i:i + n])
+        i += n
+    return out
+
+
+def parse_before(segments):
+    """Server.readdata's parsing before protocol.py: decode, split and an elif chain"""
+    from Command import COMMAND as cmd
+    parsed = [0]
+
+    def handler(*args):
+        parsed[0] += 1
+    restCmd = ""
+    for segment in segments:
+        AllData = restCmd + segment.decode('utf-8')
+        restCmd = ""
+        cmdArray = AllData.split("\n")
+        if cmdArray[-1] != "":
+            restCmd = cmdArray[-1]
+            cmdArray = cmdArray[:-1]
+        for oneCmd in cmdArray:
+            data = oneCmd.split("#")
+            try:
+                if cmd.CMD_MODE in data:
+                    handler(data[1])
+                elif cmd.CMD_MOTOR in data or cmd.CMD_M_MOTOR in data or cmd.CMD_CAR_ROTATE in data or cmd.CMD_LED in data:
+                    handler(int(data[1]), int(data[2]), int(data[3]), int(data[4]))
+                elif cmd.CMD_SERVO in data:
+                    handler(data[1], int(data[2]))
+                elif cmd.CMD_LED_MOD in data or cmd.CMD_SONIC in data or cmd.CMD_BUZZER in data or cmd.CMD_LIGHT in data:
+                    handler(data[1])
+                elif cmd.CMD_POWER in data:
+                    handler()
+            except (IndexError, ValueError):
+                pass
+    return parsed[0]
+
+
+def bench_dispatcher(handler):
+    from Command import COMMAND as cmd
+    from protocol import Dispatcher, text
+    commands = Dispatcher()
+    for token in (cmd.CMD_MOTOR, cmd.CMD_M_MOTOR, cmd.CMD_CAR_ROTATE, cmd.CMD_LED):
+        commands.register(token, handler, int, int, int, int)
+    commands.register(cmd.CMD_SERVO, handler, text, int)
+    for token in (cmd.CMD_MODE, cmd.CMD_LED_MOD, cmd.CMD_SONIC, cmd.CMD_BUZZER, cmd.CMD_LIGHT):
+        commands.register(token, handler, text)
+    commands.register(cmd.CMD_POWER, handler)
+    return commands
+
+
+def parse_after(segments):
+    from protocol import LineFramer
+    counts = [0]
+
+    def handler(*args):
+        counts[0] += 1
+    commands = bench_dispatcher(handler)
+    framer = LineFramer()
+    for segment in segments:
+        commands.dispatch(framer.feed(segment))
+    return counts[0]
+
+
+def binary_stream(stream):
+    """The same session in the binary protocol, text fields in their numeric forms"""
+    import protocol
+    modes = {b'one': 0, b'two': 1, b'three': 3, b'four': 2}
+    records = [bytes([protocol.BINARY_HELLO])]
+    for line in stream.splitlines():
+        parts = line.split(b'#')
+        values = [modes[part] if part in modes else int(part) for part in parts[1:]]
+        records.append(protocol.encode(parts[0].decode('utf-8'), *values))
+    return b''.join(records)
+
+
+def parse_binary(segments):
+    from protocol import RecordFramer
+    counts = [0]
+
+    def handler(*args):
+        counts[0] += 1
+    commands = bench_dispatcher(handler)
+    framer = RecordFramer()
+    for segment in segments:
+        for token, handler, args in commands.parse_records(framer.feed(segment)):
+            handler(*args)
+    return counts[0]
+
+
+def check_coalesce():
+    """Server.coalesce keeps the commands a batch needs, in the order sent. Parses
+    with a bare Dispatcher, so no server or hardware thread is started."""
+    from protocol import Dispatcher, text
+    from server import Server
+    commands = Dispatcher()
+    for token in ('CMD_MOTOR', 'CMD_M_MOTOR', 'CMD_CAR_ROTATE', 'CMD_LED'):
+        commands.register(token, None, int, int, int, int)
+    for token in ('CMD_MODE', 'CMD_BUZZER'):
+        commands.register(token, None, text)
+
+    def kept(*lines):
+        batch = Server.coalesce(commands.parse([line.encode('utf-8') for line in lines]))
+        return ['#'.join([token.decode('utf-8')] + [str(arg) for arg in args]) for token, handler, args in batch]
+
+    # Only the last motor or mecanum command is applied
+    assert kept('CMD_MOTOR#1#1#1#1', 'CMD_M_MOTOR#0#50#0#0', 'CMD_MOTOR#2#2#2#2') == ['CMD_MOTOR#2#2#2#2']
+    assert kept('CMD_MOTOR#1#1#1#1', 'CMD_M_MOTOR#0#50#0#0') == ['CMD_M_MOTOR#0#50#0#0']
+    # A rotate with no spin supersedes motion and earlier ones like it, but not later motion
+    assert kept('CMD_MOTOR#1#1#1#1', 'CMD_CAR_ROTATE#0#0#0#0', 'CMD_CAR_ROTATE#0#10#0#0') == ['CMD_CAR_ROTATE#0#10#0#0']
+    assert kept('CMD_CAR_ROTATE#0#0#0#0', 'CMD_MOTOR#1#1#1#1') == ['CMD_CAR_ROTATE#0#0#0#0', 'CMD_MOTOR#1#1#1#1']
+    # Spinning rotates and mode changes are barriers
+    assert kept('CMD_MOTOR#1#1#1#1', 'CMD_CAR_ROTATE#0#0#90#5', 'CMD_MOTOR#2#2#2#2') == [
+        'CMD_MOTOR#1#1#1#1', 'CMD_CAR_ROTATE#0#0#90#5', 'CMD_MOTOR#2#2#2#2']
+    assert kept('CMD_MOTOR#1#1#1#1', 'CMD_MODE#one', 'CMD_MOTOR#2#2#2#2', 'CMD_MOTOR#3#3#3#3') == [
+        'CMD_MOTOR#1#1#1#1', 'CMD_MODE#one', 'CMD_MOTOR#3#3#3#3']
+    # Everything else keeps its place
+    assert kept('CMD_LED#1#255#0#0', 'CMD_MOTOR#1#1#1#1', 'CMD_BUZZER#1', 'CMD_LED#2#0#255#0', 'CMD_MOTOR#2#2#2#2') == [
+        'CMD_LED#1#255#0#0', 'CMD_BUZZER#1', 'CMD_LED#2#0#255#0', 'CMD_MOTOR#2#2#2#2']
+
+
+def bench_Parser(n=20000, rounds=15):
+    """Parses a recorded command stream split at random points: the old text loop,
+    protocol.py's text framing, and the same commands in the binary protocol.
+    Checks Server.coalesce first."""
+    check_coalesce()
+    stream = command_stream(n)
+    binary = binary_stream(stream)
+    inputs = {'before': (parse_before, stream), 'after': (parse_after, stream), 'binary': (parse_binary, binary[1:])}
+    results = {'commands': n}
+    best = {}
+    for _ in range(rounds):  # alternate, so all see the same machine load
+        for name, (parse, data) in inputs.items():
+            segments = chunks(data)
+            start = time.perf_counter()
+            parsed = parse(segments)
+            elapsed = time.perf_counter() - start
+            best[name] = min(best.get(name, elapsed), elapsed)
+            results[name] = {'parsed': parsed, 'bytes': len(data), 'MB_s': round(len(data) / best[name] / 1e6, 2),
+                             'commands_s': round(n / best[name])}
+    print(json.dumps(results, indent=2))
+
+
+def bench_Video(slow_kb_s=300):
+    """Streams synthetic frames to one viewer whose link drops to slow_kb_s for a
+    while, and prints the tier the AdaptiveQuality controller settles on"""
+    import video
+    with contextlib.redirect_stdout(io.StringIO()):
+        server = loopback_server()
+        server.videoSource = video.SyntheticSource
+        reader = video.FrameReader.connect(*server.server_socket.getsockname())
+    results = []
+    for name, seconds, rate in (('fast', 3, None), ('slow', 10, slow_kb_s * 1024), ('fast again', 8, None)):
+        end = time.monotonic() + seconds
+        tiers, glass, received = [], [], 0
+        while time.monotonic() < end:
+            header, payload = reader.read()
+            tiers.append(header.tier)
+            glass.append(header.glass_us * 1e-6)
+            received += len(payload)
+            if rate:
+                time.sleep(len(payload) / rate)
+        results.append({'phase': name, 'frames': len(tiers), 'final_tier': tiers[-1],
+                        'kb_s': round(received / seconds / 1024), 'glass_to_socket_us': percentiles(glass)})
+    print(json.dumps({'dropped': reader.dropped, 'phases': results, 'server': server.videoStats()}, indent=2))
+    server.close()
+
+
+def bench_Reconnect(n=50):
+    """Time from a new control connection to its first command reaching the wheels,
+    with the previous connection just dropped"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        server = loopback_server()
+        address = server.server_socket1.getsockname()
+        times = []
+        for i in range(n):
+            duty = wheel_values(0, i)
+            time.sleep(random.uniform(0.01, 0.02))  # don't lock step with the Actuator
+            start = time.perf_counter()
+            client = socket.create_connection(address)
+            client.sendall(b'CMD_MOTOR#%d#0#0#0\n' % duty)
+            times.append(wait_wheel(duty, start) - start)
+            client.close()
+        server.close()
+    print(json.dumps({'reconnects': n, 'connect_to_wheels_us': percentiles(times)}, indent=2))
+
+
+def bench_Scheduler(seconds=3.0):
+    """Checks the scheduler's rates against a fake clock, then runs the server's
+    light, line and battery telemetry for real and counts threads started"""
+    from fake_hw import FakeClock
+    from scheduler import Scheduler
+    clock = FakeClock(1000.0)
+    scheduler = Scheduler(clock)
+    periods = {'light': 0.17, 'line': 0.20, 'ultrasonic': 0.23, 'power': 3.0}
+    for name, period in periods.items():
+        scheduler.every(period, lambda: None, name=name)
+    for _ in range(60000):  # one simulated minute in 1ms steps
+        clock.advance(0.001)
+        scheduler.run_pending()
+    runs = {name: scheduler.tasks[name].runs for name in periods}
+    for name, period in periods.items():
+        assert abs(runs[name] - 60 / period) <= 1, (name, runs[name])
+    # A 0.1s task whose every run takes 0.25s skips the periods it missed instead of bursting
+    scheduler = Scheduler(clock)
+    start = clock()
+    slow = scheduler.every(0.1, lambda: clock.advance(0.25), name='overrunning')
+    for _ in range(1000):
+        clock.advance(0.001)
+        scheduler.run_pending()
+    assert slow.runs + slow.missed >= 10 * (clock() - start) - 2, (slow.runs, slow.missed)
+    print("Fake clock, 60s: %s; overrunning task %d runs, %d periods skipped" % (
+        ', '.join('%s %d runs' % item for item in runs.items()), slow.runs, slow.missed))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        server = loopback_server()
+        client = socket.create_connection(server.server_socket1.getsockname())
+        time.sleep(0.1)
+    started = [0]
+    start_thread = threading.Thread.start
+
+    def counting_start(thread):
+        started[0] += 1
+        start_thread(thread)
+    threading.Thread.start = counting_start
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            server.Light = server.Line = True
+            server.startTelemetry(server.sendLight, 0.17)
+            server.startTelemetry(server.sendLine, 0.20)
+            server.Power()
+            time.sleep(seconds)
+            stats = server.scheduler.stats()
+            client.close()
+            server.close()
+    finally:
+        threading.Thread.start = start_thread
+    print(json.dumps({'seconds': seconds, 'threads_started': started[0], 'tasks': stats}, indent=2))
+
+
+def bench_Modes(seconds=2.0):
+    """CPU share of the light mode run the old way, as a loop with no sleep,
+    against ModeRuntime stepping it at its rate, and the time from stop() to
+    the motors being stopped. Line tracking is measured by bench_Line."""
+    from actuator import Actuator
+    from Light import Light
+    from modes import ModeRuntime
+    PWM = Actuator(Motor(), rate=100).start()
+    light = Light(PWM)
+    light.begin()
+    results = {}
+    for name, mode in (('light', light),):
+        busy = {}
+
+        def spin():
+            cpu, end = time.thread_time(), time.monotonic() + seconds
+            while time.monotonic() < end:
+                mode.step()
+            busy['cpu'] = time.thread_time() - cpu
+        thread = threading.Thread(target=spin)
+        thread.start()
+        thread.join()
+        runtime = ModeRuntime(PWM)
+        runtime.start(name, mode)
+        time.sleep(seconds)
+        PWM.setMotorModel(1000, 1000, 1000, 1000)
+        start = time.perf_counter()
+        runtime.stop()
+        while PWM.duties != (0, 0, 0, 0):
+            time.sleep(0.0005)
+        stopped = time.perf_counter() - start
+        stats = runtime.stats()[name]
+        results[name] = {'busy_loop_cpu_pct': round(100 * busy['cpu'] / seconds, 1),
+                         'runtime_cpu_pct': stats['cpu_pct'], 'rate': mode.rate,
+                         'steps': stats['steps'], 'overruns': stats['overruns'],
+                         'stop_to_wheels_us': round(stopped * 1e6)}
+    PWM.stop()
+    print(json.dumps(results, indent=2))
+
+
+class MotorRecorder:
+    """Stands in for the motors and records every command with its time"""
+
+    def __init__(self):
+        self.commands = []
+
+    def setMotorModel(self, duty1, duty2, duty3, duty4):
+        self.commands.append(((duty1, duty2, duty3, duty4), time.perf_counter()))
+
+
+LINE_PINS = (14, 15, 23)  # left, middle, right
+
+
+def line_trace(n=120, seed=3):
+    """A recorded-style run along a line: (pattern, seconds held) pairs.
+    Some steps repeat the pattern, a third of the changes bounce."""
+    rng = random.Random(seed)
+    return [(rng.choice((2, 2, 2, 3, 1, 6, 4, 7)), rng.uniform(0.02, 0.05)) for _ in range(n)]
+
+
+def replay_line(trace, bounce=0.0002, seed=4):
+    """Drives the fake line sensors through trace, firing their edge callbacks"""
+    rng = random.Random(seed)
+    pattern = 0
+    for new, hold in trace:
+        changed = [pin for bit, pin in zip((4, 2, 1), LINE_PINS) if (pattern ^ new) & bit]
+        if changed and rng.random() < 1 / 3:
+            pin = changed[0]
+            level = 1 if new & (4 >> LINE_PINS.index(pin)) else 0
+            for bounced in (level, 1 - level):  # contact bounce before it settles
+                GPIO.set_input(pin, bounced)
+                time.sleep(bounce)
+        for bit, pin in zip((4, 2, 1), LINE_PINS):
+            GPIO.set_input(pin, 1 if new & bit else 0)
+        pattern = new
+        time.sleep(hold)
+
+
+def poll_before(motor, seconds):
+    """The old Line_Tracking.run: read the sensors and command the motors, with no sleep"""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        LMR = 0x00
+        if GPIO.input(14) == True:
+            LMR = (LMR | 4)
+        if GPIO.input(15) == True:
+            LMR = (LMR | 2)
+        if GPIO.input(23) == True:
+            LMR = (LMR | 1)
+        if LMR == 2:
+            motor.setMotorModel(800, 800, 800, 800)
+        elif LMR == 4:
+            motor.setMotorModel(-1500, -1500, 2500, 2500)
+        elif LMR == 6:
+            motor.setMotorModel(-2000, -2000, 4000, 4000)
+        elif LMR == 1:
+            motor.setMotorModel(2500, 2500, -1500, -1500)
+        elif LMR == 3:
+            motor.setMotorModel(4000, 4000, -2000, -2000)
+        elif LMR == 7:
+            motor.setMotorModel(0, 0, 0, 0)
+
+
+def bench_Line():
+    """Replays a line sensor trace with contact bounce through the old polling
+    loop and the edge-triggered tracker: motor commands, CPU, and the
+    tracker's reaction latency from first edge to motor command"""
+    from Line_Tracking import Line_Tracking, DUTIES
+    from modes import ModeRuntime
+    trace = line_trace()
+    changes = sum(1 for (a, _), (b, _) in zip([(0, 0)] + trace, trace) if a != b)
+    seconds = sum(hold for _, hold in trace)
+    for pin in LINE_PINS:
+        GPIO.set_input(pin, 0)
+
+    before = MotorRecorder()
+    cpu = {}
+
+    def poll():
+        start = time.thread_time()
+        poll_before(before, seconds)
+        cpu['before'] = time.thread_time() - start
+    thread = threading.Thread(target=poll)
+    thread.start()
+    replay_line(trace)
+    thread.join()
+
+    for pin in LINE_PINS:
+        GPIO.set_input(pin, 0)
+    after = MotorRecorder()
+    line = Line_Tracking(after)
+    runtime = ModeRuntime(after)
+    runtime.start('line', line)
+    time.sleep(0.05)
+    replay_line(trace)
+    time.sleep(0.05)
+    runtime.stop()
+    stats = runtime.stats()['line']
+    # Every command the tracker sent must be the policy of a pattern the trace held
+    held = {DUTIES[pattern] for pattern, _ in trace}
+    assert all(duties in held for duties, _ in after.commands), after.commands
+    print(json.dumps({
+        'trace': {'steps': len(trace), 'pattern_changes': changes, 'seconds': round(seconds, 2)},
+        'before': {'motor_commands': len(before.commands), 'cpu_pct': round(100 * cpu['before'] / seconds, 1)},
+        'after': {'motor_commands': line.updates, 'steps': stats['steps'], 'cpu_pct': stats['cpu_pct'],
+                  'reaction_us': percentiles([ns / 1e9 for ns in line.latencies])},
+    }, indent=2))
+
+
+def simulate_echo(distance, noise=1.0, seed=5, trigger_pin=27, echo_pin=22):
+    """Answers each ultrasonic ping on the fake GPIO with an echo pulse as long as
+    distance() cm, give or take noise cm, from its own thread like the real sensor"""
+    rng = random.Random(seed)
+
+    def echo():
+        time.sleep(0.0004)  # the sensor sends its burst first
+        GPIO.set_input(echo_pin, 1)
+        time.sleep(max(0.0, distance() + rng.uniform(-noise, noise)) * 2 / 34300.0)
+        GPIO.set_input(echo_pin, 0)
+
+    def respond(level):
+        if level == GPIO.LOW:
+            threading.Thread(target=echo, daemon=True).start()
+    GPIO.responders[trigger_pin] = respond
+
+
+def bench_Ultrasonic(seconds=2.0, n=20):
+    """A blocking five-ping get_distance() against the background ranger's
+    instant reading: caller time and CPU per reading, and the ranger's error.
+    The blocking reading comes out long here, its busy-wait holds the GIL the
+    simulated echo needs; on the robot the echo is the sensor's."""
+    from Ultrasonic import Ultrasonic
+    simulate_echo(lambda: 80.0)
+    sensor = Ultrasonic(MotorRecorder())
+    times, cpu = [], time.thread_time()
+    for _ in range(n):
+        start = time.perf_counter()
+        before = sensor.get_distance()
+        times.append(time.perf_counter() - start)
+    before_cpu = (time.thread_time() - cpu) / n
+
+    sensor.start()
+    time.sleep(seconds)
+    calls, cpu = [], time.thread_time()
+    for _ in range(1000):
+        start = time.perf_counter()
+        after = sensor.get_distance()
+        calls.append(time.perf_counter() - start)
+    after_cpu = (time.thread_time() - cpu) / 1000
+    del GPIO.responders[27]  # the obstacle goes out of range
+    time.sleep(0.3)
+    gone = sensor.get_distance()
+    sensor.stop()
+    print(json.dumps({
+        'true_cm': 80,
+        'before': {'cm': before, 'call_us': percentiles(times), 'cpu_us_per_call': round(before_cpu * 1e6, 1)},
+        'after': {'cm': after, 'call_us': percentiles(calls), 'cpu_us_per_call': round(after_cpu * 1e6, 1),
+                  'pings_per_s': round(sensor.pings / seconds, 1), 'timeouts': sensor.timeouts},
+        'no_echo_cm': gone,
+    }, indent=2))
+
+
+def motor_write_times(PWM, seconds):
+    """Times setMotorModel calls that each change the duties, for seconds"""
+    times = []
+    end = time.monotonic() + seconds
+    i = 0
+    while time.monotonic() < end:
+        i += 1
+        start = time.perf_counter()
+        PWM.setMotorModel(1000 + i % 2, 0, 0, 0)
+        times.append(time.perf_counter() - start)
+        time.sleep(0.005)
+    return times
+
+
+def bench_Adc(seconds=1.0, byte_cost=90e-6):
+    """Blocking recvADC() against AdcSampler.latest(): caller time and I2C
+    transactions per reading, and motor write times while a light mode style
+    reader hammers the ADC the old way or the sampler runs, on a simulated
+    100kHz bus"""
+    from ADC import Adc
+    from hardware import hardware
+    from sampler import AdcSampler
+    FakeSMBus.byte_cost = byte_cost
+    PWM = Motor()
+    adc = Adc()
+    times = []
+    FakeSMBus.reset()
+    for _ in range(20):
+        start = time.perf_counter()
+        adc.recvADC(2)
+        times.append(time.perf_counter() - start)
+    before = {'call_us': percentiles(times), 'transactions_per_call': len(FakeSMBus.transactions) // 20}
+
+    running = [True]
+
+    def reader():
+        while running[0]:
+            adc.recvADC(0)
+            adc.recvADC(1)
+    thread = threading.Thread(target=reader)
+    thread.start()
+    before['motor_write_us'] = percentiles(motor_write_times(PWM, seconds))
+    running[0] = False
+    thread.join()
+
+    sampler = AdcSampler(hardware.adc, hardware.bus_lock).start()
+    FakeSMBus.reset()
+    motor = percentiles(motor_write_times(PWM, seconds))
+    transactions = sum(1 for op, address, _, _ in FakeSMBus.transactions if address == 0x48)
+    times = []
+    for _ in range(1000):
+        start = time.perf_counter()
+        sampler.latest(2)
+        times.append(time.perf_counter() - start)
+    sampler.stop()
+    FakeSMBus.byte_cost = 0.0
+    print(json.dumps({
+        'before': before,
+        'after': {'call_us': percentiles(times), 'transactions_per_call': 0,
+                  'sampler_transactions_per_s': round(transactions / seconds), 'motor_write_us': motor,
+                  'stats': sampler.stats()},
+    }, indent=2))
+
+
+class ServoRecorder:
+    """Stands in for Servo: records commands and follows them lag seconds late, like a loaded servo"""
+
+    def __init__(self, lag=0.05):
+        self.lag = lag
+        self.commands = [(0.0, 90)]
+
+    def setServoPwm(self, channel, angle):
+        self.commands.append((time.monotonic(), int(angle)))
+
+    def position(self):
+        when = time.monotonic() - self.lag
+        for t, angle in reversed(self.commands):
+            if t <= when:
+                return angle
+        return self.commands[0][1]
+
+
+def obstacle(angle):
+    """A box 25 cm away between 40 and 60 degrees, a wall at 100 cm elsewhere"""
+    return 25.0 if 40 <= angle <= 60 else 100.0
+
+
+def bench_Scan(seconds=3.0):
+    """Full left/ahead/right scans per second, stopping at 30/90/151 degrees to
+    settle and take a blocking reading as before, against the sweep scanner
+    reading on the move, and the scanner's map of a simulated box"""
+    from scanner import SweepScanner
+    from Ultrasonic import Ultrasonic
+    servo = ServoRecorder()
+    simulate_echo(lambda: obstacle(servo.position()), noise=0.5)
+    sensor = Ultrasonic(MotorRecorder())
+    scans, start = 0, time.monotonic()
+    while time.monotonic() - start < seconds:
+        for angle in (30, 90, 151):
+            servo.setServoPwm('0', angle)
+            time.sleep(0.2)
+            sensor.get_distance()
+        scans += 1
+    before = scans / (time.monotonic() - start)
+
+    sensor.start()
+    scanner = SweepScanner(servo, sensor).start()
+    time.sleep(seconds)
+    sweeps = scanner.sweeps()
+    readings = scanner.readings
+    ranges = [None if np.isnan(cm) else round(float(cm)) for cm in scanner.ranges]
+    sectors = scanner.sectors()
+    scanner.stop()
+    sensor.stop()
+    del GPIO.responders[27]
+    assert None not in sectors and sectors[0] < 40 and sectors[1] > 80 and sectors[2] > 80, (sectors, ranges)
+    print(json.dumps({
+        'before_scans_per_s': round(before, 2),
+        'after': {'scans_per_s': round(sweeps / seconds, 2), 'readings_per_scan': round(readings / max(1, sweeps), 1),
+                  'map_cm': dict(zip(range(scanner.lo, scanner.hi + 1, scanner.bin), ranges)),
+                  'left_ahead_right_cm': [round(cm) for cm in sectors]},
+    }, indent=2))
+
+
+# Main program logic follows:
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Parameter error: Please assign the benchmark")
+        exit()
+    if sys.argv[1] == 'Motor':
+        bench_Motor()
+    elif sys.argv[1] == 'Suite':
+        bench_Suite(*[float(arg) for arg in sys.argv[2:3]])
+    elif sys.argv[1] == 'Parser':
+        bench_Parser()
+    elif sys.argv[1] == 'Scheduler':
+        bench_Scheduler()
+    elif sys.argv[1] == 'Modes':
+        bench_Modes()
+    elif sys.argv[1] == 'Line':
+        bench_Line()
+    elif sys.argv[1] == 'Ultrasonic':
+        bench_Ultrasonic()
+    elif sys.argv[1] == 'Adc':
+        bench_Adc()
+    elif sys.argv[1] == 'Scan':
+        bench_Scan()
+    elif sys.argv[1] == 'Reconnect':
+        bench_Reconnect()
+    elif sys.argv[1] == 'Video':
+        bench_Video(*[float(arg) for arg in sys.argv[2:3]])
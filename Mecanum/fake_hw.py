@@ -0,0 +1,270 @@
+import sys
+import threading
+import time
+import types
+
+
+def spin(seconds):
+    """Busy-waits, time.sleep is far too coarse for per-byte bus costs"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class FakeClock:
+    """A monotonic clock that only moves when advance() is called"""
+
+    def __init__(self, start=1000.0):
+        self.time = start
+
+    def __call__(self):
+        return self.time
+
+    def advance(self, seconds):
+        self.time += seconds
+
+
+class FakeSMBus:
+    """Stands in for smbus.SMBus off the robot and records every I2C transaction.
+
+    All instances share one transaction log, like every SMBus(1) on the Pi
+    shares the one physical bus. Each transaction costs byte_cost seconds per
+    byte on the wire, address and register included.
+    """
+    transactions = []
+    registers = {}
+    written = {}  # (address, reg) -> perf_counter() of the last write
+    byte_cost = 0.0
+    lock = threading.Lock()
+
+    def __init__(self, bus=1):
+        self.bus = bus
+
+    @classmethod
+    def reset(cls):
+        cls.transactions.clear()
+
+    def _record(self, op, address, reg, nbytes):
+        with self.lock:
+            if self.byte_cost:
+                spin((nbytes + 2) * self.byte_cost)
+            self.transactions.append((op, address, reg, nbytes))
+            return time.perf_counter()
+
+    def write_byte_data(self, address, reg, value):
+        t = self._record('write_byte_data', address, reg, 1)
+        self.registers[(address, reg)] = value
+        self.written[(address, reg)] = t
+
+    def write_i2c_block_data(self, address, reg, data):
+        t = self._record('write_i2c_block_data', address, reg, len(data))
+        for i, value in enumerate(data):
+            self.registers[(address, reg + i)] = value
+            self.written[(address, reg + i)] = t
+
+    def read_byte_data(self, address, reg):
+        self._record('read_byte_data', address, reg, 1)
+        return self.registers.get((address, reg), 0)
+
+    def write_byte(self, address, value):
+        self._record('write_byte', address, None, 1)
+
+    def read_byte(self, address):
+        self._record('read_byte', address, None, 1)
+        return 0
+
+    def close(self):
+        pass
+
+    @classmethod
+    def word(cls, address, reg):
+        return cls.registers.get((address, reg), 0) | cls.registers.get((address, reg + 1), 0) << 8
+
+    @classmethod
+    def wait_word(cls, address, reg, value, after=0.0, timeout=2.0):
+        """Waits until the 16-bit register pair at reg holds value, written no earlier
+        than after, and returns when it was written"""
+        end = time.perf_counter() + timeout
+        while True:
+            if cls.word(address, reg) == value:
+                t = max(cls.written[(address, reg)], cls.written[(address, reg + 1)])
+                if t >= after:
+                    return t
+            if time.perf_counter() > end:
+                raise TimeoutError('register 0x%02x never became %d' % (reg, value))
+            time.sleep(0)
+
+
+class FakeGPIO(types.ModuleType):
+    """Stands in for RPi.GPIO: records outputs and duty changes, inputs read from levels"""
+    BCM = 11
+    BOARD = 10
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+
+    def __init__(self):
+        super().__init__('RPi.GPIO')
+        self.calls = []
+        self.levels = {}
+        self.outputs = {}  # pin -> (level, perf_counter())
+        self.duties = {}  # pin -> (duty, perf_counter())
+        self.callbacks = {}
+        self.responders = {}  # output pin -> callback(level), e.g. a simulated sensor
+        self.PWM = self._pwm_class()
+
+    def reset(self):
+        self.calls.clear()
+
+    def setmode(self, mode):
+        pass
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, pin, mode, pull_up_down=None, initial=None):
+        pass
+
+    def cleanup(self, pins=None):
+        pass
+
+    def output(self, pin, level):
+        self.calls.append(('output', pin, level))
+        self.outputs[pin] = (level, time.perf_counter())
+        if pin in self.responders:
+            self.responders[pin](level)
+
+    def input(self, pin):
+        return self.levels.get(pin, self.LOW)
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        self.callbacks[pin] = (edge, callback)
+
+    def remove_event_detect(self, pin):
+        self.callbacks.pop(pin, None)
+
+    def set_input(self, pin, level):
+        """Drives an input pin and fires its edge callback like the real library"""
+        old = self.levels.get(pin, self.LOW)
+        self.levels[pin] = level
+        if pin in self.callbacks and old != level:
+            edge, callback = self.callbacks[pin]
+            if callback and (edge == self.BOTH or edge == (self.RISING if level else self.FALLING)):
+                callback(pin)
+
+    def _pwm_class(gpio):
+        class PWM:
+            def __init__(self, pin, frequency):
+                self.pin = pin
+
+            def start(self, duty):
+                gpio.duties[self.pin] = (duty, time.perf_counter())
+
+            def ChangeDutyCycle(self, duty):
+                gpio.calls.append(('ChangeDutyCycle', self.pin, duty))
+                gpio.duties[self.pin] = (duty, time.perf_counter())
+
+            def stop(self):
+                pass
+        return PWM
+
+    def wait_duty(self, pin, duty, after=0.0, timeout=2.0):
+        """Waits until the PWM on pin runs at duty, set no earlier than after,
+        and returns when it was set"""
+        end = time.perf_counter() + timeout
+        while True:
+            value, t = self.duties.get(pin, (None, 0.0))
+            if value == duty and t >= after:
+                return t
+            if time.perf_counter() > end:
+                raise TimeoutError('pin %d never reached duty %s' % (pin, duty))
+            time.sleep(0)
+
+
+class FakeNeoPixel:
+    def __init__(self, num, pin, freq_hz=800000, dma=10, invert=False, brightness=255, channel=0):
+        self.pixels = [0] * num
+
+    def begin(self):
+        pass
+
+    def numPixels(self):
+        return len(self.pixels)
+
+    def setPixelColor(self, n, color):
+        if 0 <= n < len(self.pixels):
+            self.pixels[n] = color
+
+    def show(self):
+        pass
+
+
+class FakePicamera2:
+    def __init__(self, camera_num=0):
+        self.encoder = None
+        self.output = None
+
+    def create_video_configuration(self, main=None, **kwargs):
+        return {'main': main}
+
+    def configure(self, config):
+        self.config = config
+
+    def start_recording(self, encoder, output, quality=None):
+        self.encoder = encoder
+        self.output = output
+
+    def stop_recording(self):
+        pass
+
+    def close(self):
+        pass
+
+    def start_and_capture_file(self, name):
+        pass
+
+
+def install(byte_cost=0.0):
+    """Registers fake smbus, RPi.GPIO, rpi_ws281x and picamera2 modules so the
+    Mecanum modules import off the robot. byte_cost is the simulated I2C time per
+    byte in seconds, about 90e-6 at 100kHz. Returns the fake GPIO module."""
+    FakeSMBus.byte_cost = byte_cost
+
+    smbus = types.ModuleType('smbus')
+    smbus.SMBus = FakeSMBus
+    sys.modules['smbus'] = smbus
+
+    gpio = FakeGPIO()
+    rpi = types.ModuleType('RPi')
+    rpi.GPIO = gpio
+    sys.modules['RPi'] = rpi
+    sys.modules['RPi.GPIO'] = gpio
+
+    ws281x = types.ModuleType('rpi_ws281x')
+    ws281x.Adafruit_NeoPixel = FakeNeoPixel
+    ws281x.Color = lambda red, green, blue, white=0: (white << 24) | (red << 16) | (green << 8) | blue
+    ws281x.__all__ = ['Adafruit_NeoPixel', 'Color']
+    sys.modules['rpi_ws281x'] = ws281x
+
+    picamera2 = types.ModuleType('picamera2')
+    picamera2.Picamera2 = FakePicamera2
+    picamera2.Preview = types.SimpleNamespace(NULL=0, QTGL=1)
+    encoders = types.ModuleType('picamera2.encoders')
+    encoders.JpegEncoder = lambda q=None, **kwargs: types.SimpleNamespace(q=q)
+    encoders.Quality = types.SimpleNamespace(VERY_LOW=0, LOW=1, MEDIUM=2, HIGH=3, VERY_HIGH=4)
+    outputs = types.ModuleType('picamera2.outputs')
+    outputs.FileOutput = lambda file=None: types.SimpleNamespace(fileoutput=file)
+    outputs.Output = object
+    picamera2.encoders = encoders
+    picamera2.outputs = outputs
+    sys.modules['picamera2'] = picamera2
+    sys.modules['picamera2.encoders'] = encoders
+    sys.modules['picamera2.outputs'] = outputs
+    return gpio
@@ -0,0 +1,87 @@
+import threading
+from PCA9685 import PCA9685
+from ADC import Adc
+from sampler import AdcSampler
+
+
+class Hardware:
+    """Process-wide owner of the I2C devices.
+
+    The PCA9685 and the ADC are opened once, on first use, and the same drivers
+    are handed to every caller so they share one register shadow. After a bus
+    fault on one of them, that driver is dropped and reopened on next use. Both take bus_lock
+    around their transactions, so ADC sampling and motor writes interleave on
+    the one I2C bus instead of colliding.
+    """
+
+    def __init__(self, address=0x40, freq=50):
+        self.address = address
+        self.freq = freq
+        self.lock = threading.RLock()
+        self.bus_lock = threading.RLock()
+        self._pwm = None
+        self._adc = None
+        self._sampler = None
+
+    def pwm(self):
+        pwm = self._pwm
+        if pwm is None:
+            with self.lock:
+                if self._pwm is None:
+                    pwm = PCA9685(self.address, debug=True, lock=self.bus_lock)
+                    pwm.setPWMFreq(self.freq)
+                    self._pwm = pwm
+                pwm = self._pwm
+        return pwm
+
+    def adc(self):
+        adc = self._adc
+        if adc is None:
+            with self.lock:
+                if self._adc is None:
+                    self._adc = Adc()
+                adc = self._adc
+        return adc
+
+    def sampler(self):
+        """The running AdcSampler, for readings that don't wait on the bus"""
+        sampler = self._sampler
+        if sampler is None:
+            with self.lock:
+                if self._sampler is None:
+                    self._sampler = AdcSampler(self.adc, self.bus_lock, fault=lambda: self.fault('adc')).start()
+                sampler = self._sampler
+        return sampler
+
+    def stop_sampler(self):
+        """Stops the running AdcSampler; the next sampler() call starts a new one"""
+        with self.lock:
+            sampler, self._sampler = self._sampler, None
+        if sampler is not None:
+            sampler.stop()
+
+    def fault(self, device):
+        """Drops the 'pwm' or 'adc' driver after a bus error on it so the next use
+        reinitializes it. Waits for bus_lock, so no transaction is cut short."""
+        with self.lock, self.bus_lock:
+            if device == 'pwm':
+                driver, self._pwm = self._pwm, None
+            else:
+                driver, self._adc = self._adc, None
+            try:
+                driver.bus.close()
+            except Exception:
+                pass
+
+    def check(self):
+        """Returns True if the PCA9685 answers, reinitializing it once if the bus has faulted"""
+        for attempt in range(2):
+            try:
+                self.pwm().read(0x00)  # MODE1
+                return True
+            except OSError:
+                self.fault('pwm')
+        return False
+
+
+hardware = Hardware()
@@ -0,0 +1,66 @@
+import numpy as np
+
+# Mecanum wheel mixing shared by Server, Motor.Rotate and anything else that
+# turns a body velocity into the four wheel duties of Motor.setMotorModel.
+# Every function takes scalars or NumPy arrays, so a whole trajectory of N
+# velocity vectors converts in one call.
+
+DUTY_MAX = 4095
+
+# Integer-degree trig tables, indexed by angle % 360
+SIN = np.sin(np.radians(np.arange(360)))
+COS = np.cos(np.radians(np.arange(360)))
+
+# Rows are the wheels in setMotorModel order (FL, BL, FR, BR), columns are
+# strafe LX, forward LY and spin RX
+MIX = np.array([[1, 1, -1],
+                [-1, 1, -1],
+                [-1, 1, 1],
+                [1, 1, 1]])
+UNMIX = np.linalg.pinv(MIX)
+
+
+def polar(angle, magnitude):
+    """Returns (magnitude * sin, magnitude * cos) of integer-degree angles from the tables"""
+    index = np.asarray(angle, dtype=np.int64) % 360
+    magnitude = np.asarray(magnitude)
+    return magnitude * SIN[index], magnitude * COS[index]
+
+
+def inverse(lx, ly, rx):
+    """Wheel duties (..., 4) in FL, BL, FR, BR order for strafe lx, forward ly and spin rx"""
+    return np.stack(np.broadcast_arrays(lx, ly, rx), axis=-1) @ MIX.T
+
+
+def forward(duties):
+    """Body velocity (..., 3) as lx, ly, rx from wheel duties (..., 4) in FL, BL, FR, BR order"""
+    return np.asarray(duties) @ UNMIX.T
+
+
+def saturate(duties, limit=DUTY_MAX):
+    """Scales each set of wheel duties down together so none exceeds limit.
+
+    Clipping the wheels one by one changes the ratio between them and with it
+    the direction of travel, scaling keeps it.
+    """
+    duties = np.asarray(duties, dtype=float)
+    peak = np.abs(duties).max(axis=-1, keepdims=True)
+    scaled = np.where(peak > limit, duties * limit / np.maximum(peak, 1.0), duties)
+    return np.trunc(scaled).astype(np.int64)
+
+
+def saturate_wheels(duty1, duty2, duty3, duty4, limit=DUTY_MAX):
+    """saturate() for one set of plain-number duties, without the NumPy round
+    trip, for per-command callers like Motor.setMotorModel"""
+    peak = max(abs(duty1), abs(duty2), abs(duty3), abs(duty4))
+    if peak <= limit:
+        return int(duty1), int(duty2), int(duty3), int(duty4)
+    return int(duty1 * limit / peak), int(duty2 * limit / peak), int(duty3 * limit / peak), int(duty4 * limit / peak)
+
+
+def joystick(angle, speed, spin_angle, spin):
+    """Wheel duties for the CMD_M_MOTOR fields: travel at speed toward angle
+    (degrees clockwise from forward) while spinning at spin * sin(spin_angle)"""
+    x, y = polar(angle, speed)
+    rx, _ = polar(spin_angle, spin)
+    return saturate(inverse(-np.trunc(x), np.trunc(y), np.trunc(rx)))
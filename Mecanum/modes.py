@@ -0,0 +1,106 @@
+import threading
+import time
+
+
+class ModeStats:
+    """What one mode has cost so far, over all its runs"""
+
+    def __init__(self):
+        self.runs = 0
+        self.steps = 0
+        self.overruns = 0  # steps that finished after the next one was due
+        self.cpu = 0.0  # seconds of CPU its thread used, from time.thread_time()
+        self.wall = 0.0  # seconds it was running
+
+    def stats(self):
+        return {'runs': self.runs, 'steps': self.steps, 'overruns': self.overruns,
+                'cpu_s': round(self.cpu, 3), 'wall_s': round(self.wall, 3),
+                'cpu_pct': round(100 * self.cpu / self.wall, 1) if self.wall else 0.0}
+
+
+class ModeRuntime:
+    """Runs one autonomous mode at a time on its own thread.
+
+    A mode is an object with a rate in steps per second and a step()
+    method doing one pass of its behavior without looping. It may also
+    have begin(), called before the first step, and end(), called after
+    the last one. The runtime calls step() at the mode's rate and sleeps
+    in between. An event-driven mode also has a wakeup Event: setting it,
+    from a GPIO callback say, runs the next step at once, and its rate is
+    only how often it steps when nothing happens. stop() asks the mode to finish at the next step boundary,
+    never inside one, and whatever happens the motors are stopped before
+    it returns.
+    """
+
+    def __init__(self, motor):
+        self.motor = motor
+        self.name = None  # mode running, None when idle
+        self.thread = None
+        self.mode = None
+        self.cancel = threading.Event()  # a new one per run, so a stuck run can't see it cleared
+        self.modes = {}  # name -> ModeStats
+
+    def start(self, name, mode):
+        """Stops the current mode and runs mode in the background"""
+        self.stop()
+        self.cancel = threading.Event()
+        self.name = name
+        self.mode = mode
+        self.thread = threading.Thread(target=self.run, args=(name, mode, self.cancel), daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=1.0):
+        """Cancels the running mode, waits for its current step, then stops the motors"""
+        self.cancel.set()
+        wakeup = getattr(self.mode, 'wakeup', None)
+        if wakeup is not None:
+            wakeup.set()
+        if self.thread is not None:
+            if self.thread is not threading.current_thread():
+                self.thread.join(timeout)
+            self.thread = None
+        self.name = None
+        self.mode = None
+        self.motor.setMotorModel(0, 0, 0, 0)
+
+    def run(self, name, mode, cancel=None):
+        """Runs mode in the calling thread until stop() or Ctrl+C"""
+        cancel = cancel or self.cancel
+        stats = self.modes.setdefault(name, ModeStats())
+        stats.runs += 1
+        period = 1.0 / mode.rate
+        wakeup = getattr(mode, 'wakeup', None)
+        cpu = time.thread_time()
+        start = deadline = time.monotonic()
+        try:
+            if hasattr(mode, 'begin'):
+                mode.begin()
+            while not cancel.is_set():
+                if wakeup is not None:
+                    wakeup.clear()  # before the step, so a wakeup during it isn't lost
+                mode.step()
+                stats.steps += 1
+                deadline += period
+                delay = deadline - time.monotonic()
+                if delay < 0:
+                    stats.overruns += 1
+                    deadline = time.monotonic()
+                if wakeup is None:
+                    cancel.wait(max(0.0, delay))
+                elif wakeup.wait(max(0.0, delay)):
+                    deadline = time.monotonic()
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            print("Mode %s failed: %s" % (name, e))
+        finally:
+            self.motor.setMotorModel(0, 0, 0, 0)
+            try:
+                if hasattr(mode, 'end'):
+                    mode.end()
+            finally:
+                stats.cpu += time.thread_time() - cpu
+                stats.wall += time.monotonic() - start
+
+    def stats(self):
+        return {name: stats.stats() for name, stats in self.modes.items()}
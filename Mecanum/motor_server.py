@@ -0,0 +1,81 @@
+# Importing required packages
+import sys
+import os
+
+# Import all functions form Motor.py
+from Motor import *
+from hardware import hardware
+from actuator import Actuator
+
+# Importing flask stuff
+from flask import Flask, request, jsonify
+
+# Initiating a Flask application
+app = Flask(__name__)
+
+# Cheap to construct: the PCA9685 and ADC are opened once, on first use, by the
+# shared hardware context and reused by every request. Handlers only post
+# setpoints, the actuator thread writes the newest one to the bus at 100Hz.
+PWM = Actuator(Motor(), rate=100).start()
+
+# def process_json(data):
+#     img_width = 1080
+#     distance = data['distance']
+#     speed = (abs(distance)/2.0/img_width)*4096
+#     direction = 1 if distance > 0 else -1
+#     return math.floor(speed*direction)
+
+"""
+    Endpoint for sending signal to motors
+"""
+
+
+@app.route(rule="/move", methods=["POST"])
+def handle_move_request():
+    data = request.get_json()
+
+    # make sure there are 4 numbers
+    try:
+        # duty_cycle = process_json(data)
+        duty1 = data['duty1']
+        duty2 = data['duty2']
+        duty3 = data['duty3']
+        duty4 = data['duty4']
+    except ValueError:
+        return jsonify({"error": "All values must be numbers"}), 400
+
+    PWM.setMotorModel(duty1, duty2, duty3, duty4)
+
+    return jsonify({"status": "Successfully triggered motors"})
+
+
+"""
+    Endpoint for stopping all motors
+"""
+
+
+@app.route(rule="/stop", methods=["POST"])
+def handle_stop_request():
+    # set all motors to 0, stops all movement
+    PWM.setMotorModel(0, 0, 0, 0)
+
+    # successful message
+    return jsonify({"status": "Successfully stopped all motors"})
+
+
+"""
+    Endpoint for checking the motor driver, reinitializes it after a bus fault
+"""
+
+
+@app.route(rule="/health", methods=["GET"])
+def handle_health_request():
+    if not hardware.check():
+        return jsonify({"status": "Motor driver not responding"}), 503
+    return jsonify({"status": "ok"})
+
+
+# Running the API
+if __name__ == "__main__":
+    # Setting host = "0.0.0.0" runs it on localhost
+    app.run(host="0.0.0.0", port=8000, debug=True)
@@ -0,0 +1,226 @@
+"""Framing and dispatch for the TCP commands on port 5000.
+
+Text clients send '#'-separated, newline-terminated commands:
+
+    CMD_MOTOR#2000#2000#2000#2000\n
+
+A client that opens with the BINARY_HELLO byte (text always starts with
+'C') sends and receives fixed 9-byte RECORDs instead: an opcode from
+OPCODES and four signed 16-bit fields, zero when unused. Text fields are
+sent as their numeric forms, CMD_MODE#0 rather than CMD_MODE#one. Replies
+are records too; fractional values are scaled to integers, see
+Server.reply().
+
+LineFramer and RecordFramer receive straight into one reusable bytearray
+and split out complete commands however the stream was fragmented.
+Dispatcher looks the token or opcode up in a table and returns each
+command's handler with its fields already converted, so handlers never
+see a malformed command.
+"""
+import struct
+
+from Command import COMMAND as cmd
+
+BINARY_HELLO = 0xDC
+RECORD = struct.Struct('<B4h')
+
+# Wire opcodes, never renumber
+OPCODES = {cmd.CMD_MOTOR: 1, cmd.CMD_M_MOTOR: 2, cmd.CMD_CAR_ROTATE: 3, cmd.CMD_LED: 4,
+           cmd.CMD_LED_MOD: 5, cmd.CMD_SERVO: 6, cmd.CMD_BUZZER: 7, cmd.CMD_SONIC: 8,
+           cmd.CMD_LIGHT: 9, cmd.CMD_POWER: 10, cmd.CMD_MODE: 11, cmd.CMD_TELEMETRY: 12}
+
+
+def text(field):
+    return field.decode('utf-8')
+
+
+class Framer:
+    """Incremental framer over a fixed, reused receive buffer. Subclasses
+    implement take(), which returns the complete commands held and keeps
+    a partial one for the next receive."""
+
+    def __init__(self, size=4096):
+        self.buf = bytearray(size)
+        self.view = memoryview(self.buf)
+        self.end = 0  # bytes held
+
+    def recv_into(self, sock):
+        """Receives into the free tail of the buffer, returns the byte count, 0 on EOF"""
+        n = sock.recv_into(self.view[self.end:])
+        self.end += n
+        return n
+
+    def feed(self, data):
+        """Appends data that was received some other way, returns the commands it completes"""
+        data = memoryview(data)
+        taken = []
+        while data:
+            n = min(len(data), len(self.buf) - self.end)
+            self.view[self.end:self.end + n] = data[:n]
+            self.end += n
+            data = data[n:]
+            taken += self.take()
+        return taken
+
+    def take(self):
+        raise NotImplementedError
+
+
+class LineFramer(Framer):
+    """Frames newline-terminated text commands.
+
+    A line longer than the buffer can't be framed; it is discarded up to
+    the next newline and counted in overflows.
+    """
+
+    def __init__(self, size=4096):
+        super().__init__(size)
+        self.discarding = False  # inside an overlong line
+        self.overflows = 0
+
+    def take(self):
+        """Returns the complete lines held, as bytes without the newline"""
+        buf = self.buf
+        last = buf.rfind(b'\n', 0, self.end)
+        if last < 0:
+            if self.end == len(buf):
+                if not self.discarding:
+                    self.overflows += 1
+                    self.discarding = True
+                self.end = 0
+            return []
+        data = bytes(self.view[:last])
+        lines = data.split(b'\n')
+        if self.discarding:
+            lines[0] = b''
+            self.discarding = False
+        rest = self.end - last - 1
+        buf[:rest] = self.view[last + 1:self.end]
+        self.end = rest
+        if b'\r' in data:
+            lines = [line.rstrip(b'\r') for line in lines]
+        return [line for line in lines if line] if b'' in lines else lines
+
+
+class RecordFramer(Framer):
+    """Frames fixed-size binary records"""
+
+    def __init__(self, size=4096, record=RECORD):
+        super().__init__(size - size % record.size)
+        self.record = record
+
+    def take(self):
+        """Returns the complete records held, as tuples"""
+        whole = self.end - self.end % self.record.size
+        records = list(self.record.iter_unpack(self.view[:whole]))
+        rest = self.end - whole
+        self.buf[:rest] = self.view[whole:self.end]
+        self.end = rest
+        return records
+
+
+def open_framer(sock):
+    """Receives a new connection's first bytes and returns the framer for the mode
+    the client chose, holding them, or None if it closed without sending"""
+    framer = LineFramer()
+    if framer.recv_into(sock) == 0:
+        return None
+    if framer.buf[0] != BINARY_HELLO:
+        return framer
+    binary = RecordFramer()
+    binary.end = framer.end - 1
+    binary.view[:binary.end] = framer.view[1:framer.end]
+    return binary
+
+
+def encode(token, *values):
+    """Packs one binary record, values past the int16 range are clamped"""
+    fields = [max(-32768, min(32767, int(value))) for value in values]
+    return RECORD.pack(OPCODES[token], *(fields + [0] * (4 - len(fields))))
+
+
+def parser(fields):
+    """Returns parse(parts) -> handler arguments for a tuple of field converters.
+    The common arities are unrolled, a generic loop costs twice as much per line."""
+    if len(fields) == 0:
+        return lambda parts: ()
+    if len(fields) == 1:
+        a, = fields
+        return lambda parts: (a(parts[1]),)
+    if len(fields) == 2:
+        a, b = fields
+        return lambda parts: (a(parts[1]), b(parts[2]))
+    if len(fields) == 4:
+        a, b, c, d = fields
+        return lambda parts: (a(parts[1]), b(parts[2]), c(parts[3]), d(parts[4]))
+
+    def parse(parts):
+        if len(parts) <= len(fields):
+            raise IndexError
+        return [convert(part) for convert, part in zip(fields, parts[1:])]
+    return parse
+
+
+def record_parser(fields):
+    """Like parser(), for binary records whose fields are already ints"""
+    if all(field is int for field in fields):
+        end = len(fields) + 1
+        return lambda record: record[1:end]
+    converters = [int if field is int else str for field in fields]
+    return lambda record: [convert(value) for convert, value in zip(converters, record[1:])]
+
+
+class Dispatcher:
+    """Table of command token -> (handler, field parser).
+
+    parse() drops lines with an unknown token, missing fields or fields
+    that don't convert, counting them in unknown and invalid. Fields past
+    the ones registered are ignored.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.opcodes = {}
+        self.unknown = 0
+        self.invalid = 0
+
+    def register(self, token, handler, *fields):
+        """fields are converters such as int or text, one per argument of handler"""
+        self.handlers[token.encode('utf-8')] = (handler, parser(fields))
+        if token in OPCODES:
+            self.opcodes[OPCODES[token]] = (token.encode('utf-8'), handler, record_parser(fields))
+
+    def parse(self, lines):
+        """Returns (token, handler, args) for each valid line, in order"""
+        handlers = self.handlers
+        commands = []
+        for line in lines:
+            parts = line.split(b'#')
+            entry = handlers.get(parts[0])
+            if entry is None:
+                self.unknown += 1
+                continue
+            handler, parse = entry
+            try:
+                commands.append((parts[0], handler, parse(parts)))
+            except (IndexError, ValueError):
+                self.invalid += 1
+        return commands
+
+    def parse_records(self, records):
+        """parse() for binary records"""
+        opcodes = self.opcodes
+        commands = []
+        for record in records:
+            entry = opcodes.get(record[0])
+            if entry is None:
+                self.unknown += 1
+                continue
+            token, handler, parse = entry
+            commands.append((token, handler, parse(record)))
+        return commands
+
+    def dispatch(self, lines):
+        """Calls the handler of each valid line in order"""
+        for token, handler, args in self.parse(lines):
+            handler(*args)
@@ -0,0 +1,239 @@
+import asyncio
+from dotenv import load_dotenv
+import os
+import websockets
+import json
+import logging
+import threading
+import time
+from collections import deque
+from actuator import Mailbox
+from scheduler import percentile
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class HardwareExecutor:
+    """Runs move/stop callbacks on one worker thread so they never block the event loop.
+
+    Only the newest pending call is kept: a move that is still waiting when the
+    next one arrives is dropped, since it would be overwritten right away.
+    """
+
+    def __init__(self):
+        self.pending = Mailbox()
+        self.wakeup = threading.Event()
+        self.submitted = 0
+        self.executed = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, callback, *args):
+        self.submitted += 1
+        self.pending.put((callback, args))
+        self.wakeup.set()
+
+    @property
+    def coalesced(self):
+        return self.submitted - self.executed
+
+    def run(self):
+        while True:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            job = self.pending.take()
+            if job is None:
+                continue
+            callback, args = job
+            self.executed += 1
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f"Hardware callback failed: {e}")
+
+
+class RobotClient:
+    def __init__(self, uri, on_move=None, on_stop=None, lag_interval=0.1, lag_warning=0.05,
+                 ping_interval=2.0, stats_interval=30.0):
+        self.uri = uri
+        self.websocket = None
+        self.paired_with = None
+        self.on_move = on_move
+        self.on_stop = on_stop
+        self.executor = HardwareExecutor()
+        self.lag_interval = lag_interval  # how often the event loop lag is sampled, in seconds
+        self.lag_warning = lag_warning  # lag above this is logged, in seconds
+        self.loop_lag = 0.0
+        self.max_loop_lag = 0.0
+        # Ping/pong with the paired user, see handle_pong()
+        self.ping_interval = ping_interval
+        self.stats_interval = stats_interval  # how often command age percentiles are logged
+        self.ping_id = 0
+        self.clock_samples = deque(maxlen=8)  # (delay, offset) of the latest exchanges
+        self.rtt = None
+        self.clock_offset = None  # user clock minus robot clock, in seconds
+        self.command_ages = deque(maxlen=1000)  # one-way age of the latest move/stop messages
+
+    async def connect(self):
+        try:
+            self.websocket = await websockets.connect(f"{self.uri}?clientType=robot")
+            logger.info("Connected to WebSocket server")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect: {e}")
+            return False
+
+    async def handle_message(self, message):
+        try:
+            data = json.loads(message)
+            message_type = data.get('type')
+            
+            if message_type == 'host_pairConnect':
+                self.paired_with = data['data']
+                logger.info(f"Paired with user: {self.paired_with}")
+                # A new user has a new clock
+                self.clock_samples.clear()
+                self.command_ages.clear()
+                self.rtt = None
+                self.clock_offset = None
+
+                await self.send_message("Hello! I'm your robot assistant.")
+                
+            elif message_type == 'host_pairDisconnect':
+                logger.info("User disconnected")
+                self.paired_with = None
+                
+            elif message_type == 'client_message':
+                if self.paired_with:
+                    user_message = data['data'].get('data', {})
+                    logger.debug(f"Received message from user: {user_message}")
+
+                    if user_message.get('type') == 'pong':
+                        self.handle_pong(user_message, time.time())
+                        return
+                    if 'ts' in user_message and self.clock_offset is not None:
+                        self.command_ages.append(time.time() - (user_message['ts'] - self.clock_offset))
+
+                    # The app sends {"duty1".."duty4"} to move and {"stop": true} to stop
+                    if user_message.get('type') == 'stop' or user_message.get('stop'):
+                        if (self.on_stop):
+                            self.executor.submit(self.on_stop)
+                    elif user_message.get('type') == 'move' or 'duty1' in user_message:
+                        duty1 = user_message['duty1']
+                        duty2 = user_message['duty2']
+                        duty3 = user_message['duty3']
+                        duty4 = user_message['duty4']
+                        if (self.on_move):
+                            self.executor.submit(self.on_move, duty1, duty2, duty3, duty4)
+            
+            else:
+                logger.warning(f"Unknown message type: {message_type}")
+                
+        except json.JSONDecodeError:
+            logger.error("Failed to parse message as JSON")
+        except Exception as e:
+            logger.error(f"Error handling message: {e}")
+
+    def handle_pong(self, pong, t3):
+        """NTP-style estimate from one exchange: t0 ping sent, t1 ping received by the user,
+        t2 pong sent, t3 pong received. The sample with the lowest delay of the last few is
+        kept, as it was the least disturbed by queueing on the way."""
+        t0, t1, t2 = pong['t0'], pong['t1'], pong['t2']
+        delay = (t3 - t0) - (t2 - t1)
+        offset = ((t1 - t0) + (t2 - t3)) / 2
+        self.clock_samples.append((delay, offset))
+        self.rtt, self.clock_offset = min(self.clock_samples)
+
+    def command_age_stats(self):
+        """Percentiles of how old move/stop messages were on arrival, in seconds"""
+        ages = sorted(self.command_ages)
+        if not ages:
+            return None
+        return {
+            'count': len(ages),
+            'p50': percentile(ages, 50),
+            'p95': percentile(ages, 95),
+            'p99': percentile(ages, 99),
+            'rtt': self.rtt,
+            'clock_offset': self.clock_offset,
+        }
+
+    async def ping_loop(self):
+        last_stats = time.monotonic()
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                if self.paired_with and self.websocket:
+                    self.ping_id += 1
+                    await self.send_message({'type': 'ping', 'id': self.ping_id, 't0': time.time()})
+                if time.monotonic() - last_stats >= self.stats_interval:
+                    last_stats = time.monotonic()
+                    stats = self.command_age_stats()
+                    if stats:
+                        rtt = 'unknown' if stats['rtt'] is None else '%.1f ms' % (stats['rtt'] * 1000)
+                        logger.info("Command age p50 %.1f ms, p95 %.1f ms, p99 %.1f ms over %d, rtt %s" % (
+                            stats['p50'] * 1000, stats['p95'] * 1000, stats['p99'] * 1000, stats['count'], rtt))
+            except Exception as e:
+                logger.error(f"Ping loop error: {e}")
+
+    async def send_message(self, content):
+        if not self.websocket:
+            logger.error("Not connected to server")
+            return
+            
+        try:
+            message = {
+                "type": "client_message",
+                "data": content
+            }
+            await self.websocket.send(json.dumps(message))
+            logger.debug(f"Sent message: {content}")
+        except Exception as e:
+            logger.error(f"Failed to send message: {e}")
+
+    async def monitor_loop_lag(self):
+        """Measures how late the event loop wakes up from a sleep, i.e. how long it was blocked"""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag = max(0.0, loop.time() - start - self.lag_interval)
+            self.max_loop_lag = max(self.max_loop_lag, self.loop_lag)
+            if self.loop_lag > self.lag_warning:
+                logger.warning(f"Event loop was blocked for {self.loop_lag * 1000:.1f} ms")
+
+    async def run(self):
+        self.lag_task = asyncio.ensure_future(self.monitor_loop_lag())
+        self.ping_task = asyncio.ensure_future(self.ping_loop())
+        while True:
+            try:
+                if not self.websocket:
+                    success = await self.connect()
+                    if not success:
+                        await asyncio.sleep(5)  # Wait before retrying
+                        continue
+
+                async for message in self.websocket:
+                    await self.handle_message(message)
+                    
+            except websockets.exceptions.ConnectionClosed:
+                logger.warning("Connection closed, attempting to reconnect...")
+                self.websocket = None
+                self.paired_with = None
+                await asyncio.sleep(5)  # Wait before retrying
+                
+            except Exception as e:
+                logger.error(f"Unexpected error: {e}")
+                self.websocket = None
+                self.paired_with = None
+                await asyncio.sleep(5)  # Wait before retrying
+
+
+load_dotenv()
+
+async def main():
+    robot = RobotClient("ws://producti-bunserverloadba-fa9cd61bac9251c5.elb.us-west-2.amazonaws.com/ws")
+    await robot.run()
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,89 @@
+import time
+from collections import deque
+from scheduler import Periodic
+
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def mean(values):
+    return sum(values) / len(values)
+
+
+class AdcSampler(Periodic):
+    """Reads the ADC channels round-robin from one thread and caches the readings.
+
+    Each of the rate scans per second reads every channel, one channel per
+    tick so the reads are spread evenly over the scan. A channel is read as
+    oversample conversions and their median goes into the channel's ring
+    of the last window readings. latest() returns filter() of that ring,
+    computed when the reading arrived, so callers never touch the bus.
+
+    lock is the I2C bus lock the motor driver also takes. It is held for
+    one channel's conversions only, never across a sleep, so a motor write
+    waits at most that long. open_adc returns the Adc driver and is called
+    for every read so a driver reopened after a bus fault is picked up;
+    fault is called on a bus error.
+    """
+
+    def __init__(self, open_adc, lock, channels=(0, 1, 2), rate=20, oversample=3, window=4,
+                 filter=median, fault=None):
+        self.open_adc = open_adc
+        self.lock = lock
+        self.channels = channels
+        self.period = 1.0 / (rate * len(channels))  # between channel reads
+        self.next = 0  # index of the channel the next tick reads
+        self.oversample = oversample
+        self.filter = filter
+        self.fault = fault
+        self.window = window
+        self.rings = {channel: deque(maxlen=window) for channel in channels}
+        self.values = {}  # channel -> filtered volts
+        self.updated = {}  # channel -> time.monotonic() of its last reading
+        self.reads = 0
+        self.errors = 0
+
+    def read(self, channel):
+        """Reads channel from the bus now and stores the reading"""
+        try:
+            adc = self.open_adc()
+            with self.lock:
+                raw = adc.analogRead(channel, self.oversample)
+        except OSError:
+            self.errors += 1
+            if self.fault is not None:
+                self.fault()
+            return
+        ring = self.rings.setdefault(channel, deque(maxlen=self.window))
+        ring.append(adc.toVoltage(median(raw)))
+        self.values[channel] = self.filter(ring)
+        self.updated[channel] = time.monotonic()
+        self.reads += 1
+
+    def start(self):
+        if self.thread is None:
+            for channel in self.channels:  # so latest() has a reading from the start
+                self.read(channel)
+        return super().start()
+
+    def tick(self):
+        self.read(self.channels[self.next])
+        self.next = (self.next + 1) % len(self.channels)
+
+    def latest(self, channel):
+        """The channel's filtered reading in volts, without waiting for the bus
+        unless the channel has never been read"""
+        if channel not in self.values:
+            self.read(channel)
+        return self.values[channel]
+
+    def recvADC(self, channel):
+        """latest(), under the Adc method name so the sampler can stand in for the driver"""
+        return self.latest(channel)
+
+    def stats(self):
+        now = time.monotonic()
+        return {'reads': self.reads, 'errors': self.errors,
+                'age_ms': {channel: round((now - t) * 1e3, 1) for channel, t in self.updated.items()}}
@@ -0,0 +1,89 @@
+import time
+
+import numpy as np
+
+from scheduler import Periodic
+
+
+class SweepScanner(Periodic):
+    """Sweeps the ultrasonic servo back and forth and maps ranges by angle.
+
+    The servo follows a triangle wave between lo and hi degrees at speed
+    degrees per second, stepped rate times a second, and never stops to
+    settle. Each reading the background ranger takes on the way is tagged
+    with the angle the trajectory had lag seconds before the echo, for the
+    servo trailing its command, and written into a fixed polar array of
+    bin-degree bins: ranges holds each bin's latest distance in cm, NaN
+    until seen, and updated its time.monotonic_ns(). Both are updated in
+    place, so readers never wait on the scan.
+    """
+
+    def __init__(self, servo, ranger, lo=30, hi=150, speed=360.0, rate=50, bin=10, lag=0.05, channel='0'):
+        self.servo = servo
+        self.ranger = ranger  # a started Ultrasonic
+        self.lo = lo
+        self.hi = hi
+        self.speed = speed
+        self.period = 1.0 / rate
+        self.bin = bin
+        self.lag_ns = int(lag * 1e9)
+        self.channel = channel
+        self.ranges = np.full((hi - lo) // bin + 1, np.nan, dtype=np.float32)
+        self.updated = np.zeros(len(self.ranges), dtype=np.int64)
+        self.start_ns = None
+        self.seen_ns = 0  # newest reading already mapped
+        self.readings = 0
+
+    def angle(self, t_ns):
+        """Where the trajectory had the servo at t_ns"""
+        span = self.hi - self.lo
+        travel = (t_ns - self.start_ns) / 1e9 * self.speed % (2 * span)
+        return self.lo + (travel if travel <= span else 2 * span - travel)
+
+    def sweeps(self):
+        """Complete passes from one end to the other so far"""
+        if self.start_ns is None:
+            return 0
+        return int((time.monotonic_ns() - self.start_ns) / 1e9 * self.speed // (self.hi - self.lo))
+
+    def start(self):
+        if self.thread is None:
+            self.ranges[:] = np.nan
+            self.updated[:] = 0
+            self.start_ns = self.seen_ns = time.monotonic_ns()
+        return super().start()
+
+    def stop(self):
+        super().stop()
+        self.servo.setServoPwm(self.channel, 90)
+
+    def tick(self):
+        self.step(time.monotonic_ns())
+
+    def step(self, now_ns):
+        """Moves the servo to the trajectory's angle for now_ns and maps the new readings"""
+        self.servo.setServoPwm(self.channel, self.angle(now_ns))
+        for t_ns, cm in list(self.ranger.readings):
+            if t_ns > self.seen_ns:
+                self.seen_ns = t_ns
+                if t_ns - self.lag_ns >= self.start_ns:
+                    i = int(round((self.angle(t_ns - self.lag_ns) - self.lo) / self.bin))
+                    self.ranges[i] = cm
+                    self.updated[i] = t_ns
+                    self.readings += 1
+
+    def nearest(self, lo, hi, max_age=1.0):
+        """Closest range in cm seen between lo and hi degrees in the last max_age
+        seconds, None if none"""
+        first = max(0, int(np.ceil((lo - self.lo) / self.bin)))
+        last = int((hi - self.lo) // self.bin) + 1
+        fresh = self.updated[first:last] >= time.monotonic_ns() - int(max_age * 1e9)
+        ranges = self.ranges[first:last][fresh]
+        return float(ranges.min()) if len(ranges) else None
+
+    def sectors(self, width=40, max_age=1.0):
+        """Closest ranges to the left (lo), ahead (90) and right (hi), None where
+        nothing was seen: no echo is not a clear path"""
+        return (self.nearest(self.lo, self.lo + width, max_age),
+                self.nearest(90 - width / 2, 90 + width / 2, max_age),
+                self.nearest(self.hi - width, self.hi, max_age))
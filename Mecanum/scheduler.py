@@ -0,0 +1,179 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, len(ordered) * p // 100)]
+
+
+class Periodic:
+    """Base for a component that calls its tick() every period seconds on its
+    own thread.
+
+    Paced like Scheduler: deadlines advance by one period, and a tick that
+    overruns restarts the schedule from now instead of bursting to catch up.
+    Subclasses set period and extend start() and stop() for their own setup
+    and teardown.
+    """
+    period = 0.01
+    running = False
+    thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def loop(self):
+        deadline = time.monotonic()
+        while self.running:
+            self.tick()
+            deadline += self.period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()  # overran, don't try to catch up
+
+    def tick(self):
+        raise NotImplementedError
+
+
+class Task:
+    """One scheduled callback. period is None for a one-shot."""
+
+    def __init__(self, name, callback, period, deadline):
+        self.name = name
+        self.callback = callback
+        self.period = period
+        self.deadline = deadline
+        self.cancelled = False
+        self.runs = 0
+        self.missed = 0  # periods skipped because a run started more than a period late
+        self.lateness = deque(maxlen=256)  # seconds each run started after its deadline
+
+    def stats(self):
+        stats = {'runs': self.runs, 'missed': self.missed}
+        if self.lateness:
+            lateness = sorted(self.lateness)
+            stats['lateness_ms'] = {'p50': round(percentile(lateness, 50) * 1e3, 2),
+                                    'p95': round(percentile(lateness, 95) * 1e3, 2),
+                                    'max': round(lateness[-1] * 1e3, 2)}
+        return stats
+
+
+class Scheduler:
+    """Runs periodic and one-shot callbacks from one thread, off a heap of deadlines.
+
+    Periodic deadlines advance by exactly one period from the previous
+    deadline, not from when the callback finished, so the rate doesn't drift.
+    A run that starts more than a period late skips the missed periods
+    instead of bursting to catch up. clock is time.monotonic on the robot;
+    with a fake clock, drive the scheduler with run_pending() instead of start().
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.heap = []
+        self.counter = itertools.count()  # breaks deadline ties in insertion order
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.running = False
+        self.thread = None
+
+    def every(self, period, callback, name=None, delay=None):
+        """Calls callback every period seconds, the first time after delay (default period)"""
+        return self.schedule(name, callback, period, period if delay is None else delay)
+
+    def after(self, delay, callback, name=None):
+        """Calls callback once, delay seconds from now"""
+        return self.schedule(name, callback, None, delay)
+
+    def schedule(self, name, callback, period, delay):
+        task = Task(name or callback.__name__, callback, period, self.clock() + delay)
+        with self.lock:
+            self.tasks[task.name] = task
+            heapq.heappush(self.heap, (task.deadline, next(self.counter), task))
+        self.wakeup.set()
+        return task
+
+    def cancel(self, task):
+        """Stops task; it is safe to cancel a task twice, or from its own callback"""
+        if task is None:
+            return
+        with self.lock:
+            task.cancelled = True
+            if self.tasks.get(task.name) is task:
+                del self.tasks[task.name]
+
+    def run_pending(self):
+        """Runs every task that is due, returns the seconds until the next deadline,
+        None if nothing is scheduled"""
+        while True:
+            with self.lock:
+                while self.heap and self.heap[0][2].cancelled:
+                    heapq.heappop(self.heap)
+                if not self.heap:
+                    return None
+                now = self.clock()
+                deadline, _, task = self.heap[0]
+                if deadline > now:
+                    return deadline - now
+                heapq.heappop(self.heap)
+            task.runs += 1
+            task.lateness.append(now - deadline)
+            try:
+                task.callback()
+            except Exception as e:
+                print("Task %s failed: %s" % (task.name, e))
+            with self.lock:
+                if task.cancelled:
+                    continue
+                if task.period is None:
+                    if self.tasks.get(task.name) is task:
+                        del self.tasks[task.name]
+                    continue
+                task.deadline += task.period
+                now = self.clock()
+                if task.deadline <= now:
+                    skipped = int((now - task.deadline) // task.period) + 1
+                    task.missed += skipped
+                    task.deadline += skipped * task.period
+                heapq.heappush(self.heap, (task.deadline, next(self.counter), task))
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        while self.running:
+            self.wakeup.clear()
+            delay = self.run_pending()
+            self.wakeup.wait(delay)
+
+    def stats(self):
+        with self.lock:
+            tasks = list(self.tasks.values())
+        return {task.name: task.stats() for task in tasks}
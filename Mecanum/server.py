@@ -0,0 +1,703 @@
+#!/usr/bin/python 
+# -*- coding: utf-8 -*-
+import io
+import math
+import socket
+import numpy as np
+import struct
+import time
+from picamera2 import Picamera2, Preview
+from threading import Condition
+import fcntl
+import queue
+import selectors
+import sys
+import threading
+from Motor import *
+from servo import *
+from Led import *
+from Buzzer import *
+from ADC import *
+from hardware import hardware
+from actuator import Actuator
+import kinematics
+from Thread import *
+from Light import *
+from Ultrasonic import *
+from Line_Tracking import *
+from threading import Thread
+from Command import COMMAND as cmd
+import protocol
+from protocol import Dispatcher, RecordFramer, open_framer, text
+import video
+from video import FrameRing, CameraSource
+from modes import ModeRuntime
+from scheduler import Scheduler
+from telemetry import TelemetryStream
+import RPi.GPIO as GPIO
+
+
+# Commands a later one in the same receive batch makes redundant, and the ones that
+# must not be reordered around them. CMD_CAR_ROTATE is either, depending on its spin.
+MOTION_COMMANDS = {token.encode('utf-8') for token in (cmd.CMD_MOTOR, cmd.CMD_M_MOTOR)}
+BARRIER_COMMANDS = {cmd.CMD_MODE.encode('utf-8')}
+ROTATE = cmd.CMD_CAR_ROTATE.encode('utf-8')
+# Only the client holding the motor lease may send these
+LEASED_COMMANDS = MOTION_COMMANDS | BARRIER_COMMANDS | {ROTATE}
+# Handlers that wait, on a mode thread or a sleep, so they run off the selector thread
+BLOCKING_COMMANDS = {token.encode('utf-8') for token in (cmd.CMD_MODE, cmd.CMD_LED_MOD)}
+
+
+class ControlClient:
+    """One connection on the control port and the protocol it chose.
+
+    Its socket is non-blocking. What the socket won't take yet waits in
+    outbox for the selector thread to flush, and a client that lets more
+    than max_backlog bytes pile up has stopped reading: it is marked
+    stalled and the selector thread closes it.
+    """
+    max_backlog = 65536
+
+    def __init__(self, connection, address):
+        self.connection = connection
+        self.address = address
+        self.framer = None  # chosen by the first bytes received
+        self.binary = False
+        self.stream = None  # its TelemetryStream once it sends CMD_TELEMETRY#1
+        self.outbox = bytearray()
+        self.lock = threading.Lock()  # replies come from the selector, command and scheduler threads
+        self.stalled = False
+        self.events = selectors.EVENT_READ  # what the selector waits on for it
+        self.stats = {'received': 0, 'applied': 0, 'coalesced': 0, 'denied': 0}
+
+    def send(self, token, fields, values):
+        if self.binary:
+            self.write(protocol.encode(token, *values))
+        else:
+            self.write((token + '#' + fields + '\n').encode('utf-8'))
+
+    def write(self, data):
+        """Sends data without blocking, queueing what the socket doesn't take.
+        Raises OSError if the client has stopped reading."""
+        with self.lock:
+            if self.stalled:
+                raise OSError('client stopped reading')
+            self.outbox += data
+            self.send_outbox()
+            if len(self.outbox) > self.max_backlog:
+                self.stalled = True
+                self.outbox.clear()
+                raise OSError('client stopped reading')
+
+    def flush(self):
+        """Sends what the socket takes of the outbox"""
+        with self.lock:
+            self.send_outbox()
+
+    def send_outbox(self):
+        try:
+            while self.outbox:
+                del self.outbox[:self.connection.send(self.outbox)]
+        except BlockingIOError:
+            pass
+
+
+class CommandWorker:
+    """Runs handlers in submission order on one thread, so the ones that block
+    never hold up the selector thread"""
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.pending = 0  # submitted and not finished yet
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, callback, *args):
+        with self.lock:
+            self.pending += 1
+        self.jobs.put((callback, args))
+
+    def busy(self):
+        return self.pending > 0
+
+    def stop(self):
+        """Finishes the queued handlers and ends the thread"""
+        self.jobs.put(None)
+        self.thread.join()
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            callback, args = job
+            try:
+                callback(*args)
+            except Exception as e:
+                print(e)
+            with self.lock:
+                self.pending -= 1
+
+
+class Server:
+    def __init__(self):
+        self.motor = Motor()
+        # Every producer below posts to the actuator, which owns the motor writes
+        self.PWM = Actuator(self.motor, rate=100).start()
+        self.servo = Servo()
+        self.led = Led()
+        self.ultrasonic = Ultrasonic(self.PWM).start()  # ranges in the background, readings are instant
+        self.buzzer = Buzzer()
+        self.adc = hardware.sampler()  # cached readings, sampled in the background
+        self.light = Light(self.PWM)
+        self.infrared = Line_Tracking(self.PWM)
+        self.modes = ModeRuntime(self.PWM)  # runs the light, ultrasonic and line modes
+        self.tcp_Flag = True
+        self.sonic = False
+        self.Light = False
+        self.Light = False
+        self.Line = False
+        self.Mode = 'one'
+        self.endChar = '\n'
+        self.intervalChar = '#'
+        self.rotation_flag = False
+        self.rotateThread = None
+        self.ledThread = None
+        self.commands = self.commandTable()
+        self.worker = CommandWorker()  # runs BLOCKING_COMMANDS, and whatever arrives behind them
+        self.scheduler = Scheduler().start()
+        self.telemetry = {}  # name -> its periodic scheduler Task
+        self.selector = None
+        self.serving = False
+        self.controlClients = []  # in connection order
+        self.controller = None  # the ControlClient holding the motor lease
+        self.client = None  # the ControlClient whose commands are being handled
+        self.frames = FrameRing()
+        self.camera = None
+        self.videoClients = {}  # connection -> its Subscriber
+        self.videoQuality = video.AdaptiveQuality()
+        self.videoSource = self.openCamera  # video.SyntheticSource off the robot
+
+    def get_interface_ip(self):
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        return socket.inet_ntoa(fcntl.ioctl(s.fileno(),
+                                            0x8915,
+                                            struct.pack('256s', b'wlan0'[:15])
+                                            )[20:24])
+
+    def listen(self, host, port, backlog):
+        listener = socket.socket()
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        listener.bind((host, port))
+        listener.listen(backlog)
+        listener.setblocking(False)
+        return listener
+
+    def StartTcpServer(self, host=None, control_port=5000, video_port=8000):
+        """Opens the control and video listeners and serves every client from one
+        selector thread. The listeners stay open until StopTcpServer(), so a client
+        that drops can reconnect at once."""
+        if self.serving:
+            return
+        HOST = host or str(self.get_interface_ip())
+        self.server_socket1 = self.listen(HOST, control_port, 5)
+        self.server_socket = self.listen(HOST, video_port, 5)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server_socket1, selectors.EVENT_READ, lambda listener, events: self.acceptControl(listener))
+        self.selector.register(self.server_socket, selectors.EVENT_READ, lambda listener, events: self.acceptVideo(listener))
+        self.serving = True
+        self.serveThread = Thread(target=self.serve, daemon=True)
+        self.serveThread.start()
+        print('Server address: ' + HOST)
+
+    def StopTcpServer(self):
+        for task in list(self.telemetry.values()):
+            self.scheduler.cancel(task)
+        self.telemetry.clear()
+        if self.serving:
+            self.serving = False
+            self.serveThread.join()
+        for connection in list(self.videoClients):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self.camera is not None:
+            self.camera.stop()
+            self.camera = None
+
+    def close(self):
+        """Stops serving and every background thread the server started, motors last"""
+        self.StopTcpServer()
+        self.worker.stop()
+        self.modes.stop()
+        self.scheduler.stop()
+        self.ultrasonic.stop()
+        hardware.stop_sampler()
+        self.PWM.stop()
+
+    def serve(self):
+        while self.serving:
+            self.watchControl()
+            for key, events in self.selector.select(timeout=0.2):
+                try:
+                    key.data(key.fileobj, events)
+                except Exception as e:
+                    print(e)
+        for client in list(self.controlClients):
+            self.closeControl(client)
+        self.selector.close()
+        self.server_socket1.close()
+        self.server_socket.close()
+
+    def acceptControl(self, listener):
+        try:
+            connection, address = listener.accept()
+        except OSError:
+            return
+        connection.setblocking(False)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = ControlClient(connection, address)
+        self.controlClients.append(client)
+        if self.controller is None:
+            self.controller = client
+        self.selector.register(connection, client.events, lambda connection, events: self.serviceControl(client, events))
+        print("Client connection successful ! " + str(address))
+
+    def watchControl(self):
+        """Closes stalled control clients and waits for the rest to be writable
+        only while they have replies queued"""
+        for client in list(self.controlClients):
+            if client.stalled:
+                print("Client stopped reading " + str(client.address))
+                self.closeControl(client)
+                continue
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.outbox else 0)
+            if events != client.events:
+                client.events = events
+                self.selector.modify(client.connection, events, self.selector.get_key(client.connection).data)
+
+    def serviceControl(self, client, events):
+        if events & selectors.EVENT_WRITE:
+            try:
+                client.flush()
+            except OSError:
+                self.closeControl(client)
+                return
+        if events & selectors.EVENT_READ:
+            self.readControl(client)
+
+    def closeControl(self, client):
+        self.selector.unregister(client.connection)
+        client.connection.close()
+        self.controlClients.remove(client)
+        print("Client disconnected " + str(client.address) + ": " + str(client.stats))
+        if client is self.controller:
+            # Nobody steers a robot that lost its driver: stop, then hand the lease on
+            self.controller = self.controlClients[0] if self.controlClients else None
+            try:
+                stop_thread(self.rotateThread)
+            except:
+                pass
+            self.rotation_flag = False
+            self.PWM.setMotorModel(0, 0, 0, 0)
+
+    def readControl(self, client):
+        try:
+            if client.framer is None:
+                client.framer = open_framer(client.connection)
+                client.binary = isinstance(client.framer, RecordFramer)
+                received = client.framer is not None
+            else:
+                received = client.framer.recv_into(client.connection)
+        except BlockingIOError:
+            return
+        except OSError:
+            received = 0
+        if not received:
+            self.closeControl(client)
+            return
+        if client.binary:
+            commands = self.commands.parse_records(client.framer.take())
+        else:
+            lines = client.framer.take()
+            print(lines)
+            commands = self.commands.parse(lines)
+        batch = self.coalesce(commands)
+        client.stats['received'] += len(commands)
+        client.stats['coalesced'] += len(commands) - len(batch)
+        for token, handler, args in batch:
+            if token in LEASED_COMMANDS and client is not self.controller:
+                client.stats['denied'] += 1
+                continue
+            client.stats['applied'] += 1
+            if token in BLOCKING_COMMANDS or self.worker.busy():
+                # Queued behind a blocking one, so commands still run in the order sent
+                self.worker.submit(self.handle, client, handler, args)
+            else:
+                self.handle(client, handler, args)
+
+    def handle(self, client, handler, args):
+        """Runs one command's handler with client as the one to reply to"""
+        self.client = client
+        try:
+            handler(*args)
+        except Exception as e:
+            print(e)
+        finally:
+            self.client = None
+
+    def reply(self, token, fields, *values, client=None, periodic=False):
+        """Sends token#fields to text clients, or token and the int values as one
+        record to binary ones. Goes to client, or to every control client if None;
+        periodic telemetry skips clients that get the combined stream instead.
+        Raises OSError if there are clients to send to and none received it."""
+        receivers = [client] if client else list(self.controlClients)
+        if periodic:
+            receivers = [receiver for receiver in receivers if receiver.stream is None]
+        sent = 0
+        for receiver in receivers:
+            try:
+                receiver.send(token, fields, values)
+                sent += 1
+            except OSError:
+                pass
+        if not sent and (receivers or not self.controlClients):
+            raise OSError('no control client')
+
+    def acceptVideo(self, listener):
+        try:
+            connection, client_address = listener.accept()
+        except OSError:
+            return
+        connection.setblocking(True)
+        print("socket video connected ... ")
+        # A small send buffer keeps stale frames out of the kernel, the ring drops them instead
+        connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+        if self.camera is None:
+            # Started by the first viewer and kept configured until StopTcpServer(); it
+            # only captures while someone is subscribed to the ring
+            try:
+                self.camera = self.videoSource(self.videoQuality).start(self.frames)
+            except Exception:
+                connection.close()
+                raise
+        self.videoClients[connection] = None  # subscribes once the header version is known
+        Thread(target=self.streamVideo, args=(connection,), daemon=True).start()
+
+    def openCamera(self, quality):
+        return CameraSource(Picamera2(), quality)
+
+    def streamVideo(self, connection):
+        subscriber = None
+        try:
+            version = video.negotiate(connection)
+            subscriber = self.videoClients[connection] = self.frames.subscribe()
+            while connection in self.videoClients:
+                item = subscriber.read(timeout=1.0)
+                if item is None:
+                    continue
+                seq, frame = item
+                queued = video.backlog(connection)  # still unsent from earlier frames
+                start = time.perf_counter()
+                video.send_frame(connection, seq, frame, version)
+                self.videoQuality.observe(time.perf_counter() - start, queued)
+                subscriber.sent += 1
+        except Exception as e:
+            print("Video stream failed: " + str(e))
+        if subscriber:
+            self.frames.unsubscribe(subscriber)
+        self.videoClients.pop(connection, None)
+        connection.close()
+        print("End transmit ... " + str(subscriber.stats() if subscriber else {}))
+
+    def videoStats(self):
+        """Frames captured, the current tier, and each viewer's sent and dropped
+        frames and queueing delay"""
+        return {'captured': self.frames.seq,
+                'tier': self.videoQuality.tier,
+                'viewers': [subscriber.stats() for subscriber in list(self.videoClients.values()) if subscriber]}
+
+    def modeStats(self):
+        """Steps, overruns and CPU time of each autonomous mode run so far"""
+        return self.modes.stats()
+
+    def stopMode(self):
+        running = self.modes.name
+        self.modes.stop()
+        if running == 'three':
+            self.servo.setServoPwm('0', 90)
+            self.servo.setServoPwm('1', 90)
+        self.sonic = False
+        self.Light = False
+        self.Line = False
+        for send in (self.sendUltrasonic, self.sendLight, self.sendLine):
+            self.stopTelemetry(send)
+        self.reply(cmd.CMD_MODE, '1#0#0', 1, 0, 0)
+        self.reply(cmd.CMD_MODE, '3#0', 3, 0)
+        self.reply(cmd.CMD_MODE, '2#000', 2, 0)
+
+    def commandTable(self):
+        commands = Dispatcher()
+        commands.register(cmd.CMD_MODE, self.setMode, text)
+        commands.register(cmd.CMD_MOTOR, self.moveMotor, int, int, int, int)
+        commands.register(cmd.CMD_M_MOTOR, self.moveMecanum, int, int, int, int)
+        commands.register(cmd.CMD_CAR_ROTATE, self.rotateCar, int, int, int, int)
+        commands.register(cmd.CMD_SERVO, self.setServo, text, int)
+        commands.register(cmd.CMD_LED, self.setLed, int, int, int, int)
+        commands.register(cmd.CMD_LED_MOD, self.setLedMode, text)
+        commands.register(cmd.CMD_SONIC, self.setSonic, text)
+        commands.register(cmd.CMD_BUZZER, self.setBuzzer, text)
+        commands.register(cmd.CMD_LIGHT, self.setLight, text)
+        commands.register(cmd.CMD_POWER, self.sendPower)
+        commands.register(cmd.CMD_TELEMETRY, self.setTelemetry, text)
+        return commands
+
+    @staticmethod
+    def coalesce(commands):
+        """Drops motion commands that a later one in the same batch overwrites.
+
+        Only the last motor or mecanum command before a barrier is applied. A
+        rotate with no spin also stops the rotation thread, so only a later
+        one of those supersedes it. Mode changes and spinning rotates start
+        or stop threads, so they are barriers and motion on either side of
+        them is kept. Everything else keeps its place in the batch.
+        """
+        batch = []
+        superseded = False  # a later motion command was already kept
+        stopped = False  # a later rotate with no spin was already kept
+        for command in reversed(commands):
+            token, handler, args = command
+            if token == ROTATE:
+                if args[3] != 0:
+                    superseded = stopped = False
+                elif stopped:
+                    continue
+                else:
+                    superseded = stopped = True
+            elif token in MOTION_COMMANDS:
+                if superseded:
+                    continue
+                superseded = True
+            elif token in BARRIER_COMMANDS:
+                superseded = stopped = False
+            batch.append(command)
+        batch.reverse()
+        return batch
+
+    def setMode(self, mode):
+        if mode == 'one' or mode == "0":
+            self.stopMode()
+            self.Mode = 'one'
+        elif mode == 'two' or mode == "1":
+            self.stopMode()
+            self.Mode = 'two'
+            self.modes.start('two', self.light)
+            self.Light = True
+            self.startTelemetry(self.sendLight, 0.17, delay=0.3)
+        elif mode == 'three' or mode == "3":
+            self.stopMode()
+            self.Mode = 'three'
+            self.modes.start('three', self.ultrasonic)
+            self.sonic = True
+            self.startTelemetry(self.sendUltrasonic, 0.23, delay=0.2)
+        elif mode == 'four' or mode == "2":
+            self.stopMode()
+            self.Mode = 'four'
+            self.modes.start('four', self.infrared)
+            self.Line = True
+            self.startTelemetry(self.sendLine, 0.20, delay=0.4)
+
+    def moveMotor(self, duty1, duty2, duty3, duty4):
+        if self.Mode == 'one':
+            self.PWM.setMotorModel(duty1, duty2, duty3, duty4)
+
+    def moveMecanum(self, angle, speed, spin_angle, spin):
+        if self.Mode == 'one':
+            FL, BL, FR, BR = kinematics.joystick(angle, speed, spin_angle, spin).tolist()
+            self.PWM.setMotorModel(FL, BL, FR, BR)
+
+    def rotateCar(self, angle, speed, spin_angle, spin):
+        if self.Mode != 'one':
+            return
+        if spin == 0:
+            try:
+                stop_thread(self.rotateThread)
+                self.rotation_flag = False
+            except:
+                pass
+            FL, BL, FR, BR = kinematics.joystick(angle, speed, spin_angle, spin).tolist()
+            self.PWM.setMotorModel(FL, BL, FR, BR)
+        elif self.rotation_flag == False:
+            self.angle = spin_angle
+            try:
+                stop_thread(self.rotateThread)
+            except:
+                pass
+            self.rotation_flag = True
+            self.rotateThread = Thread(target=self.motor.Rotate, args=(spin_angle, self.PWM))
+            self.rotateThread.start()
+
+    def setServo(self, channel, angle):
+        self.servo.setServoPwm(channel, angle)
+
+    def setLed(self, mode, red, green, blue):
+        self.led.ledIndex(mode, red, green, blue)
+
+    def setLedMode(self, mode):
+        self.LedMoD = mode
+        if self.LedMoD == '0':
+            try:
+                stop_thread(self.ledThread)
+            except:
+                pass
+        if self.LedMoD == '1':
+            try:
+                stop_thread(self.ledThread)
+            except:
+                pass
+            self.led.ledMode(self.LedMoD)
+            time.sleep(0.1)
+            self.led.ledMode(self.LedMoD)
+        else:
+            try:
+                stop_thread(self.ledThread)
+            except:
+                pass
+            time.sleep(0.1)
+            self.ledThread = Thread(target=self.led.ledMode, args=(mode,))
+            self.ledThread.start()
+
+    def setSonic(self, flag):
+        if flag == '1':
+            self.sonic = True
+            self.startTelemetry(self.sendUltrasonic, 0.23, delay=0.5)
+        else:
+            self.sonic = False
+            self.stopTelemetry(self.sendUltrasonic)
+
+    def setBuzzer(self, flag):
+        self.buzzer.run(flag)
+
+    def setLight(self, flag):
+        if flag == '1':
+            self.Light = True
+            self.startTelemetry(self.sendLight, 0.17, delay=0.3)
+        else:
+            self.Light = False
+            self.stopTelemetry(self.sendLight)
+
+    def setTelemetry(self, flag):
+        """CMD_TELEMETRY#1 switches the sending client to the combined stream, #0 back"""
+        client = self.client
+        if flag == '1':
+            client.stream = TelemetryStream(client.binary)
+            self.startTelemetry(self.sendCombined, 0.2, delay=0)
+        else:
+            client.stream = None
+
+    def sampleTelemetry(self):
+        """Reads every enabled channel once, scaled to the integers telemetry.py describes"""
+        sample = {'power': (round(self.adc.recvADC(2) * 300),)}
+        if self.Light:
+            sample['light'] = (round(self.adc.recvADC(0) * 100), round(self.adc.recvADC(1) * 100))
+        if self.Line:
+            sample['line'] = ((1 if GPIO.input(14) else 0) << 2 | (1 if GPIO.input(15) else 0) << 1
+                              | (1 if GPIO.input(23) else 0),)
+        if self.sonic:
+            sample['sonic'] = (self.ultrasonic.get_distance() or 0,)  # 0 for no reading, as a timed out ping was
+        return sample
+
+    def sendCombined(self):
+        clients = [client for client in list(self.controlClients) if client.stream is not None]
+        if not clients:
+            self.stopTelemetry(self.sendCombined)
+            return
+        sample = self.sampleTelemetry()
+        for client in clients:
+            message = client.stream.frame(sample)
+            if message is not None:
+                try:
+                    client.write(message)
+                except OSError:
+                    pass
+
+    def sendPower(self):
+        ADC_Power = self.adc.recvADC(2) * 3
+        try:
+            self.reply(cmd.CMD_POWER, str(round(ADC_Power, 2)), round(ADC_Power * 100), client=self.client)
+        except:
+            pass
+
+    def startTelemetry(self, send, period, delay=None):
+        """Calls send every period seconds on the scheduler, replacing any earlier task for it"""
+        self.stopTelemetry(send)
+        self.telemetry[send.__name__] = self.scheduler.every(period, send, delay=delay)
+
+    def stopTelemetry(self, send):
+        self.scheduler.cancel(self.telemetry.pop(send.__name__, None))
+
+    def sendUltrasonic(self):
+        if self.sonic == True:
+            ADC_Ultrasonic = self.ultrasonic.get_distance() or 0  # 0 for no reading, as a timed out ping was
+            # print('distanse: '+str(ADC_Ultrasonic))
+            try:
+                self.reply(cmd.CMD_MODE, "3#" + str(ADC_Ultrasonic), 3, ADC_Ultrasonic, periodic=True)
+            except:
+                self.sonic = False
+        if self.sonic == False:
+            self.stopTelemetry(self.sendUltrasonic)
+
+    def sendLight(self):
+        if self.Light == True:
+            ADC_Light1 = self.adc.recvADC(0)
+            ADC_Light2 = self.adc.recvADC(1)
+            try:
+                # binary replies carry volts as hundredths
+                self.reply(cmd.CMD_MODE, "1#" + str(ADC_Light1) + '#' + str(ADC_Light2),
+                           1, round(ADC_Light1 * 100), round(ADC_Light2 * 100), periodic=True)
+            except:
+                self.Light = False
+        if self.Light == False:
+            self.stopTelemetry(self.sendLight)
+
+    def sendLine(self):
+        if self.Line == True:
+            Line1 = 1 if GPIO.input(14) else 0
+            Line2 = 1 if GPIO.input(15) else 0
+            Line3 = 1 if GPIO.input(23) else 0
+            try:
+                # binary replies carry the three sensors as a bitmask, left sensor highest
+                self.reply(cmd.CMD_MODE, "2#" + str(Line1) + str(Line2) + str(Line3),
+                           2, Line1 << 2 | Line2 << 1 | Line3, periodic=True)
+            except:
+                self.Line = False
+        if self.Line == False:
+            self.stopTelemetry(self.sendLine)
+
+    def Power(self):
+        """Reports the battery every 3 seconds and beeps when it runs low"""
+        self.startTelemetry(self.checkPower, 3.0, delay=0)
+
+    def checkPower(self):
+        ADC_Power = self.adc.recvADC(2) * 3
+        try:
+            self.reply(cmd.CMD_POWER, str(round(ADC_Power, 2)), round(ADC_Power * 100), periodic=True)
+        except:
+            pass
+        if ADC_Power < 6.5:
+            self.beep(4)
+        elif ADC_Power < 7:
+            self.beep(2)
+        else:
+            self.buzzer.run('0')
+
+    def beep(self, count):
+        """count 0.1s beeps 0.1s apart, as one-shots on the scheduler"""
+        for i in range(count):
+            self.scheduler.after(0.2 * i, lambda: self.buzzer.run('1'), name='beep on')
+            self.scheduler.after(0.2 * i + 0.1, lambda: self.buzzer.run('0'), name='beep off')
+
+if __name__ == '__main__':
+    pass
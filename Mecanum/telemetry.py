@@ -0,0 +1,68 @@
+"""Combined, delta-encoded telemetry for control clients that opt in with
+CMD_TELEMETRY#1.
+
+Once per tick the server samples every enabled channel and sends each
+opted-in client one message with only the channels that changed since
+the last message that client got. Every keyframe_every ticks, and first
+of all, a keyframe carries every enabled channel and replaces the
+client's whole state, so channels missing from it are disabled; a channel
+being enabled or disabled forces one. Values are integers:
+
+    power  battery, hundredths of a volt
+    light  left and right photoresistors, hundredths of a volt
+    line   line sensors as a bitmask, left sensor highest
+    sonic  distance, cm, 0 with no recent echo
+
+Text clients get one line:
+
+    CMD_TELEMETRY#<seq>#<K or D>#power=790#light=123,145\n
+
+Binary clients get one send of records: a header (opcode, 0, seq mod
+2**15, 1 for a keyframe, channel count), then one record per channel
+(opcode, channel id, values...).
+"""
+import protocol
+from Command import COMMAND as cmd
+
+CHANNEL_IDS = {'power': 1, 'light': 2, 'line': 3, 'sonic': 4}
+
+
+class TelemetryStream:
+    """One client's view of the telemetry: what it was sent last"""
+
+    def __init__(self, binary=False, keyframe_every=25):
+        self.binary = binary
+        self.keyframe_every = keyframe_every
+        self.last = {}
+        self.seq = 0
+        self.sent = 0
+        self.keyframes = 0
+
+    def frame(self, sample):
+        """Returns the message for sample, None if nothing changed and no keyframe is due"""
+        keyframe = self.seq % self.keyframe_every == 0 or sample.keys() != self.last.keys()
+        if keyframe:
+            changed = sample
+        else:
+            changed = {name: values for name, values in sample.items() if self.last.get(name) != values}
+        self.seq += 1
+        if not changed and not keyframe:
+            return None
+        self.last = dict(sample)
+        self.sent += 1
+        self.keyframes += keyframe
+        if self.binary:
+            return encode_binary(self.seq - 1, keyframe, changed)
+        return encode_text(self.seq - 1, keyframe, changed)
+
+
+def encode_text(seq, keyframe, channels):
+    fields = ['%s=%s' % (name, ','.join(map(str, values))) for name, values in channels.items()]
+    return ('#'.join([cmd.CMD_TELEMETRY, str(seq), 'K' if keyframe else 'D'] + fields) + '\n').encode('utf-8')
+
+
+def encode_binary(seq, keyframe, channels):
+    records = [protocol.encode(cmd.CMD_TELEMETRY, 0, seq & 0x7FFF, int(keyframe), len(channels))]
+    for name, values in channels.items():
+        records.append(protocol.encode(cmd.CMD_TELEMETRY, CHANNEL_IDS[name], *values))
+    return b''.join(records)
@@ -0,0 +1,356 @@
+"""Video frames from the camera to any number of TCP viewers.
+
+A viewer that sends HELLO right after connecting gets a versioned header in
+front of every frame:
+
+    magic   2s  b'DC'
+    version B   2
+    tier    B   index into TIERS the frame was encoded at
+    length  I   JPEG bytes that follow
+    seq     I   frame sequence number, gaps are frames this viewer missed
+    capture q   sensor timestamp, time.monotonic_ns() on the robot
+    encode  I   JPEG encode time in us
+    glass   I   capture to socket write in us
+
+Viewers that send nothing get the original <I length prefix.
+
+Run this file on the viewer side to watch a stream's drops and latency:
+
+    python video.py <robot ip> [port]
+"""
+import fcntl
+import io
+import socket
+import struct
+import sys
+import termios
+import threading
+import time
+from collections import deque, namedtuple
+from threading import Condition
+
+from scheduler import Periodic, percentile
+
+PORT = 8000
+HELLO = b'DC\x02'
+MAGIC = b'DC'
+VERSION = 2
+HEADER = struct.Struct('<2sBBIIqII')
+LEGACY_HEADER = struct.Struct('<I')
+
+Frame = namedtuple('Frame', 'data capture_ns encode_us tier published_ns')
+Header = namedtuple('Header', 'version tier length seq capture_ns encode_us glass_us')
+
+
+class FrameRing(io.BufferedIOBase):
+    """Fixed-capacity ring of encoded JPEG frames shared by any number of viewers.
+
+    A frame source calls publish() once per frame, or write() when it is a
+    picamera2 FileOutput. It never waits on a viewer: it stores a reference
+    to the complete frame in the oldest slot and wakes the readers. Each
+    viewer reads through its own Subscriber cursor. Sources wait in
+    wait_for_viewers() while nobody is subscribed, so nothing is captured or
+    encoded for an empty room.
+    """
+
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self.frames = [None] * capacity
+        self.seq = 0  # sequence number the next frame will get, also frames captured so far
+        self.subscribers = 0
+        self.condition = Condition()
+
+    def publish(self, data, capture_ns, encode_us=0, tier=0):
+        frame = Frame(data, capture_ns, encode_us, tier, time.monotonic_ns())
+        with self.condition:
+            self.frames[self.seq % self.capacity] = frame
+            self.seq += 1
+            self.condition.notify_all()
+
+    def write(self, buf):
+        self.publish(buf, time.monotonic_ns())
+        return len(buf)
+
+    def writable(self):
+        return True
+
+    def subscribe(self):
+        with self.condition:
+            self.subscribers += 1
+            self.condition.notify_all()
+        return Subscriber(self)
+
+    def unsubscribe(self, subscriber):
+        with self.condition:
+            self.subscribers -= 1
+
+    def wait_for_viewers(self, timeout):
+        """Returns True once anyone is subscribed, False if nobody is after timeout"""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.subscribers > 0, timeout)
+
+
+class Subscriber:
+    """One viewer's read cursor into a FrameRing.
+
+    read() always hands out the newest frame. Frames published while the
+    viewer was busy sending are dropped for this viewer and counted, never
+    queued behind it. sent is counted by the caller once a frame is out.
+    """
+
+    def __init__(self, ring):
+        self.ring = ring
+        self.cursor = ring.seq
+        self.sent = 0
+        self.dropped = 0
+        self.delays = deque(maxlen=1000)  # ns each frame waited between publish and read
+
+    def read(self, timeout=None):
+        """Returns (seq, Frame) of the newest frame, or None if none arrives within timeout.
+        Frame.data is the encoder's buffer, nothing is copied."""
+        ring = self.ring
+        with ring.condition:
+            if not ring.condition.wait_for(lambda: self.cursor < ring.seq, timeout):
+                return None
+            seq = ring.seq - 1
+            frame = ring.frames[seq % ring.capacity]
+        self.dropped += seq - self.cursor
+        self.cursor = seq + 1
+        self.delays.append(time.monotonic_ns() - frame.published_ns)
+        return seq, frame
+
+    def stats(self):
+        delays = sorted(self.delays)
+        stats = {'sent': self.sent, 'dropped': self.dropped}
+        if delays:
+            stats['queue_us'] = {'p%d' % p: percentile(delays, p) // 1000 for p in (50, 95, 99)}
+        return stats
+
+
+# (capture size, JPEG quality) from lightest to heaviest, the header's tier is the index
+TIERS = (((320, 240), 50), ((400, 300), 70), ((400, 300), 90), ((640, 480), 85))
+
+
+class AdaptiveQuality:
+    """Picks the encode tier from how the viewers' sockets keep up.
+
+    Each viewer reports every frame's send time and the bytes of earlier
+    frames still queued in its socket when the frame was ready. down_after congested frames in a row drop one tier, up_after
+    clear frames in a row raise one. The congested and clear thresholds are
+    apart, so a link near one tier's limit doesn't flap between two tiers.
+    """
+
+    def __init__(self, tiers=TIERS, start=2, down_after=3, up_after=90,
+                 send_high=0.05, send_low=0.01, backlog_high=65536, backlog_low=8192):
+        self.tiers = tiers
+        self.tier = start
+        self.down_after = down_after
+        self.up_after = up_after
+        self.send_high = send_high
+        self.send_low = send_low
+        self.backlog_high = backlog_high
+        self.backlog_low = backlog_low
+        self.congested = 0
+        self.clear = 0
+        self.lock = threading.Lock()
+
+    def settings(self):
+        """Returns (tier, size, quality) to encode the next frame with"""
+        tier = self.tier
+        size, quality = self.tiers[tier]
+        return tier, size, quality
+
+    def observe(self, send_time, backlog):
+        with self.lock:
+            if send_time > self.send_high or backlog > self.backlog_high:
+                self.congested += 1
+                self.clear = 0
+                if self.congested >= self.down_after and self.tier > 0:
+                    self.tier -= 1
+                    self.congested = 0
+            elif send_time < self.send_low and backlog < self.backlog_low:
+                self.clear += 1
+                self.congested = 0
+                if self.clear >= self.up_after and self.tier < len(self.tiers) - 1:
+                    self.tier += 1
+                    self.clear = 0
+            else:
+                self.congested = 0
+                self.clear = 0
+
+
+def backlog(sock):
+    """Bytes written to sock that the kernel hasn't sent yet"""
+    return struct.unpack('i', fcntl.ioctl(sock.fileno(), termios.TIOCOUTQ, b'\0\0\0\0'))[0]
+
+
+class CameraSource(Periodic):
+    """Captures from a Picamera2 and encodes each frame itself, so every frame
+    carries its sensor timestamp and encode time, and the tier can change
+    between frames.
+
+    picamera2's JpegEncoder and FileOutput only hand over the finished bytes.
+    capture_request() waits for the sensor, so ticks aren't paced further.
+    """
+    period = 0
+    # picamera2 pixel format -> simplejpeg colorspace of the same memory layout
+    COLORSPACES = {'XBGR8888': 'RGBX', 'XRGB8888': 'BGRX', 'BGR888': 'RGB', 'RGB888': 'BGR'}
+
+    def __init__(self, camera, quality):
+        import simplejpeg  # installed with picamera2, only needed on the robot
+        self.encode_jpeg = simplejpeg.encode_jpeg
+        self.camera = camera
+        self.quality = quality
+        self.size = None
+        self.ring = None
+
+    def configure(self, size):
+        if self.size is not None:
+            self.camera.stop()
+        self.camera.configure(self.camera.create_video_configuration(main={"size": size}))
+        self.colorspace = self.COLORSPACES[self.camera.camera_config['main']['format']]
+        self.camera.start()
+        self.size = size
+
+    def start(self, ring):
+        self.ring = ring
+        return super().start()
+
+    def stop(self):
+        super().stop()
+        self.camera.stop()
+        self.camera.close()
+
+    def tick(self):
+        if not self.ring.wait_for_viewers(0.2):
+            return  # the camera stays configured, so the next viewer gets frames at once
+        tier, size, quality = self.quality.settings()
+        if size != self.size:
+            self.configure(size)
+        request = self.camera.capture_request()
+        try:
+            capture_ns = request.get_metadata()['SensorTimestamp']
+            array = request.make_array('main')
+        finally:
+            request.release()
+        start = time.perf_counter_ns()
+        data = self.encode_jpeg(array, quality, self.colorspace)
+        self.ring.publish(data, capture_ns, (time.perf_counter_ns() - start) // 1000, tier)
+
+
+class SyntheticSource(Periodic):
+    """Stands in for CameraSource off the robot: publishes JPEG-sized frames
+    at rate per second, sized like the current tier would encode them."""
+
+    def __init__(self, quality, rate=30, bytes_per_pixel=0.25):
+        self.quality = quality
+        self.period = 1.0 / rate
+        self.bytes_per_pixel = bytes_per_pixel  # at quality 100
+        self.ring = None
+
+    def start(self, ring):
+        self.ring = ring
+        return super().start()
+
+    def tick(self):
+        if not self.ring.wait_for_viewers(0.2):
+            return
+        tier, (width, height), quality = self.quality.settings()
+        n = int(width * height * self.bytes_per_pixel * quality / 100)
+        self.ring.publish(b'\xff\xd8' + bytes(max(0, n - 4)) + b'\xff\xd9', time.monotonic_ns(), 0, tier)
+
+
+def sendmsgall(sock, buffers):
+    """sendmsg() that finishes partial sends. The header and frame normally
+    leave in one syscall, without being joined into a new buffer first."""
+    views = [memoryview(b).cast('B') for b in buffers]
+    while views:
+        sent = sock.sendmsg(views)
+        while views and sent >= len(views[0]):
+            sent -= len(views[0])
+            views.pop(0)
+        if views:
+            views[0] = views[0][sent:]
+
+
+def negotiate(connection, timeout=0.5):
+    """Returns the header version a new viewer asked for, 1 if it sent no HELLO"""
+    connection.settimeout(timeout)
+    try:
+        hello = connection.recv(len(HELLO))
+    except socket.timeout:
+        hello = b''
+    finally:
+        connection.settimeout(None)
+    return VERSION if hello == HELLO else 1
+
+
+def send_frame(connection, seq, frame, version):
+    if version == 1:
+        sendmsgall(connection, (LEGACY_HEADER.pack(len(frame.data)), frame.data))
+        return
+    glass_us = (time.monotonic_ns() - frame.capture_ns) // 1000
+    header = HEADER.pack(MAGIC, VERSION, frame.tier, len(frame.data), seq & 0xFFFFFFFF,
+                         frame.capture_ns, frame.encode_us, max(0, glass_us))
+    sendmsgall(connection, (header, frame.data))
+
+
+class FrameReader:
+    """Viewer side decoder for the versioned stream.
+
+    read() returns (Header, payload). dropped counts frames the robot
+    skipped for this viewer, from gaps in the sequence numbers.
+    """
+
+    def __init__(self, sock):
+        self.stream = sock.makefile('rb')
+        self.last_seq = None
+        self.frames = 0
+        self.dropped = 0
+
+    def read_exactly(self, n):
+        data = self.stream.read(n)
+        if len(data) != n:
+            raise EOFError('stream closed')
+        return data
+
+    def read(self):
+        magic, *fields = HEADER.unpack(self.read_exactly(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError('bad frame magic %r' % magic)
+        header = Header(*fields)
+        if self.last_seq is not None:
+            self.dropped += (header.seq - self.last_seq - 1) & 0xFFFFFFFF
+        self.last_seq = header.seq
+        self.frames += 1
+        return header, self.read_exactly(header.length)
+
+    @classmethod
+    def connect(cls, host, port=PORT):
+        sock = socket.create_connection((host, port))
+        sock.sendall(HELLO)
+        return cls(sock)
+
+
+def watch(host, port=PORT):
+    """Prints frames, drops and glass-to-socket latency once a second"""
+    reader = FrameReader.connect(host, port)
+    glass = []
+    start = time.monotonic()
+    while True:
+        header, payload = reader.read()
+        glass.append(header.glass_us)
+        if time.monotonic() - start >= 1.0:
+            glass.sort()
+            print('frames %d dropped %d tier %d %d bytes, glass-to-socket p50 %d us p95 %d us, encode %d us'
+                  % (reader.frames, reader.dropped, header.tier, len(payload),
+                     percentile(glass, 50), percentile(glass, 95), header.encode_us))
+            glass.clear()
+            start = time.monotonic()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Parameter error: Please assign the robot address")
+        exit()
+    watch(sys.argv[1], *[int(arg) for arg in sys.argv[2:3]])
@@ -1,5 +1,7 @@
 from flask import Flask, request, jsonify
+import threading
 import RPi.GPIO as GPIO
+from motor_udp import UdpControlServer
 
 app = Flask(__name__)
 
@@ -21,60 +23,89 @@ for motor in motors.values():
     GPIO.setup(motor['pwm'], GPIO.OUT)
     motor['pwm_obj'] = GPIO.PWM(motor['pwm'], 100)
     motor['pwm_obj'].start(0)
+    # Last written pin levels and duty, None until first written
+    motor['state'] = {'fwd': None, 'bwd': None, 'duty': 0}
+
+# (fwd pin, bwd pin) levels for each direction
+levels = {
+    'fwd':  (GPIO.HIGH, GPIO.LOW),
+    'bwd':  (GPIO.LOW, GPIO.HIGH),
+    'stop': (GPIO.LOW, GPIO.LOW),
+}
+
+# Direction of each motor for every command
+directions = {
+    'forward':        {'front_left': 'fwd',  'front_right': 'fwd',  'back_left': 'fwd',  'back_right': 'fwd'},
+    'backward':       {'front_left': 'bwd',  'front_right': 'bwd',  'back_left': 'bwd',  'back_right': 'bwd'},
+    'left':           {'front_left': 'bwd',  'front_right': 'fwd',  'back_left': 'fwd',  'back_right': 'bwd'},
+    'right':          {'front_left': 'fwd',  'front_right': 'bwd',  'back_left': 'bwd',  'back_right': 'fwd'},
+    'backward left':  {'front_left': 'bwd',  'front_right': 'stop', 'back_left': 'stop', 'back_right': 'bwd'},
+    'backward right': {'front_left': 'stop', 'front_right': 'bwd',  'back_left': 'bwd',  'back_right': 'stop'},
+    'forward left':   {'front_left': 'stop', 'front_right': 'fwd',  'back_left': 'fwd',  'back_right': 'stop'},
+    'forward right':  {'front_left': 'fwd',  'front_right': 'stop', 'back_left': 'stop', 'back_right': 'fwd'},
+    'stop':           {'front_left': 'stop', 'front_right': 'stop', 'back_left': 'stop', 'back_right': 'stop'},
+}
+
+# Precomputed per command: (motor, fwd level, bwd level, driven) for every motor
+command_table = {
+    command: [(m, levels[d][0], levels[d][1], d != 'stop') for m, d in targets.items()]
+    for command, targets in directions.items()
+}
+
+# Serializes the HTTP and UDP threads so the cached state matches the pins
+gpio_lock = threading.Lock()
 
 # Control functions
+def write_motor(motor, fwd_level, bwd_level, speed):
+    """Writes only the pins and duty that differ from the motor's current state"""
+    m = motors[motor]
+    state = m['state']
+    if state['fwd'] != fwd_level:
+        GPIO.output(m['fwd'], fwd_level)
+        state['fwd'] = fwd_level
+    if state['bwd'] != bwd_level:
+        GPIO.output(m['bwd'], bwd_level)
+        state['bwd'] = bwd_level
+    if state['duty'] != speed:
+        m['pwm_obj'].ChangeDutyCycle(speed)
+        state['duty'] = speed
+
 def set_motor(motor, direction, speed):
-    fwd = motors[motor]['fwd']
-    bwd = motors[motor]['bwd']
-    pwm = motors[motor]['pwm_obj']
-    if direction == 'fwd':
-        GPIO.output(fwd, GPIO.HIGH)
-        GPIO.output(bwd, GPIO.LOW)
-    elif direction == 'bwd':
-        GPIO.output(fwd, GPIO.LOW)
-        GPIO.output(bwd, GPIO.HIGH)
-    else:
-        GPIO.output(fwd, GPIO.LOW)
-        GPIO.output(bwd, GPIO.LOW)
-        speed = 0
-    pwm.ChangeDutyCycle(speed)
+    fwd_level, bwd_level = levels.get(direction, levels['stop'])
+    with gpio_lock:
+        write_motor(motor, fwd_level, bwd_level, speed if direction in ('fwd', 'bwd') else 0)
+
+def apply_command(command, speed):
+    with gpio_lock:
+        for motor, fwd_level, bwd_level, driven in command_table[command]:
+            write_motor(motor, fwd_level, bwd_level, speed if driven else 0)
 
 def move_forward(speed):
-    for m in motors: set_motor(m, 'fwd', speed)
+    apply_command('forward', speed)
 def move_backward(speed):
-    for m in motors: set_motor(m, 'bwd', speed)
+    apply_command('backward', speed)
 def move_left(speed):
-    set_motor('front_left', 'bwd', speed)
-    set_motor('front_right', 'fwd', speed)
-    set_motor('back_left', 'fwd', speed)
-    set_motor('back_right', 'bwd', speed)
+    apply_command('left', speed)
 def move_right(speed):
-    set_motor('front_left', 'fwd', speed)
-    set_motor('front_right', 'bwd', speed)
-    set_motor('back_left', 'bwd', speed)
-    set_motor('back_right', 'fwd', speed)
+    apply_command('right', speed)
 def move_backward_left(speed):
-    set_motor('front_left', 'bwd', speed)
-    set_motor('front_right', 'stop', 0)
-    set_motor('back_left', 'stop', 0)
-    set_motor('back_right', 'bwd', speed)
+    apply_command('backward left', speed)
 def move_backward_right(speed):
-    set_motor('front_left', 'stop', 0)
-    set_motor('front_right', 'bwd', speed)
-    set_motor('back_left', 'bwd', speed)
-    set_motor('back_right', 'stop', 0)
+    apply_command('backward right', speed)
 def move_forward_left(speed):
-    set_motor('front_left', 'stop', 0)
-    set_motor('front_right', 'fwd', speed)
-    set_motor('back_left', 'fwd', speed)
-    set_motor('back_right', 'stop', 0)
+    apply_command('forward left', speed)
 def move_forward_right(speed):
-    set_motor('front_left', 'fwd', speed)
-    set_motor('front_right', 'stop', 0)
-    set_motor('back_left', 'stop', 0)
-    set_motor('back_right', 'fwd', speed)
-def stop():           
-    for m in motors: set_motor(m, 'stop', 0)
+    apply_command('forward right', speed)
+def stop():
+    apply_command('stop', 0)
+
+# Shared by the HTTP and UDP transports, stops on an unknown command
+def run_command(command, speed):
+    if command not in command_table:
+        stop()
+        return False
+    apply_command(command, speed)
+    return True
 
 # API route
 @app.route('/move', methods=['POST'])
@@ -83,27 +114,7 @@ def move():
     command = data['command']
     speed = data['speed']
     print(speed, command)
-    if command == 'forward':
-        move_forward(speed)
-    elif command == 'backward':
-        move_backward(speed)
-    elif command == 'left':
-        move_left(speed)
-    elif command == 'right':
-        move_right(speed)
-    elif command == 'backward left':
-        move_backward_left(speed)
-    elif command == 'backward right':
-        move_backward_right(speed)
-    elif command == 'forward left':
-        move_forward_left(speed)
-    elif command == 'forward right':
-        move_forward_right(speed)
-    elif command == 'stop':
-        stop()
-    
-    else:
-        stop()
+    if not run_command(command, speed):
         return jsonify({'status': 'error', 'message': 'Unknown command'}), 400
     return jsonify({'status': 'ok', 'command': command, 'speed': speed})
 
@@ -116,6 +127,8 @@ def shutdown():
 
 if __name__ == '__main__':
     try:
+        # Binary UDP commands on port 8001, alongside the HTTP API
+        UdpControlServer(lambda packet: run_command(packet.command, packet.speed)).start()
         app.run(host='0.0.0.0', port=8000)
     finally:
         stop()
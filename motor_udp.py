@@ -0,0 +1,167 @@
+"""Binary UDP control transport for motor-server.py.
+
+Each datagram is one fixed-size struct: sequence number, command id, speed
+and the client's send timestamp. There is no handshake and no reply, so a
+direction change costs one packet instead of an HTTP request. Packets that
+arrive out of order or duplicated are dropped by sequence number.
+
+Run this file directly for a loopback latency test:
+
+    python motor_udp.py [count]
+"""
+import collections
+import socket
+import struct
+import sys
+import threading
+import time
+
+PORT = 8001
+
+# sequence (uint32), command id (uint8), speed in % duty 0-100 (uint8), client time.time() (float64)
+PACKET = struct.Struct('<IBBd')
+
+COMMANDS = ('stop', 'forward', 'backward', 'left', 'right',
+            'forward left', 'forward right', 'backward left', 'backward right')
+COMMAND_IDS = {name: i for i, name in enumerate(COMMANDS)}
+
+# A sequence number this far behind the last one means the client restarted
+RESTART_GAP = 1024
+
+Packet = collections.namedtuple('Packet', 'seq command speed timestamp')
+
+
+def encode(seq, command, speed, timestamp=None):
+    if timestamp is None:
+        timestamp = time.time()
+    return PACKET.pack(seq & 0xFFFFFFFF, COMMAND_IDS[command], int(speed), timestamp)
+
+
+def decode(data):
+    """Returns the Packet in data, raises ValueError if it is malformed"""
+    if len(data) != PACKET.size:
+        raise ValueError('bad packet size %d' % len(data))
+    seq, command_id, speed, timestamp = PACKET.unpack(data)
+    if command_id >= len(COMMANDS):
+        raise ValueError('unknown command id %d' % command_id)
+    if speed > 100:
+        raise ValueError('speed %d out of range' % speed)
+    return Packet(seq, COMMANDS[command_id], speed, timestamp)
+
+
+class SequenceFilter:
+    """Accepts each sequence number only if it is newer than the last accepted one.
+
+    Comparison is modulo 2**32 so the counter may wrap.
+    """
+
+    def __init__(self):
+        self.last = None
+
+    def accept(self, seq):
+        if self.last is not None:
+            ahead = (seq - self.last) & 0xFFFFFFFF
+            if ahead == 0 or (ahead >= 0x80000000 and 0x100000000 - ahead < RESTART_GAP):
+                return False
+        self.last = seq
+        return True
+
+
+class UdpControlServer:
+    """Receives control packets and calls handler(packet) for each in-order one.
+
+    An exception from handler is printed and counted, and only drops that packet.
+    """
+
+    def __init__(self, handler, host='0.0.0.0', port=PORT):
+        self.handler = handler
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.address = self.sock.getsockname()
+        self.filters = {}  # per client address
+        self.received = 0
+        self.dropped = 0
+        self.errors = 0  # packets the handler raised on
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def serve_forever(self):
+        buf = bytearray(PACKET.size + 1)  # one spare byte to notice oversized packets
+        view = memoryview(buf)
+        while True:
+            try:
+                n, client = self.sock.recvfrom_into(buf)
+            except OSError:
+                break  # closed
+            self.received += 1
+            try:
+                packet = decode(view[:n])
+            except ValueError:
+                self.dropped += 1
+                continue
+            seq_filter = self.filters.get(client)
+            if seq_filter is None:
+                seq_filter = self.filters[client] = SequenceFilter()
+            if not seq_filter.accept(packet.seq):
+                self.dropped += 1
+                continue
+            try:
+                self.handler(packet)
+            except Exception as e:
+                self.errors += 1
+                print('UDP control handler failed on %s: %s' % (packet, e))
+
+    def close(self):
+        self.sock.close()
+
+
+class UdpControlClient:
+    """Reference client: numbers and sends commands to a UdpControlServer"""
+
+    def __init__(self, host, port=PORT):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect((host, port))
+        self.seq = 0
+
+    def send(self, command, speed=0):
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        self.sock.send(encode(self.seq, command, speed))
+
+    def close(self):
+        self.sock.close()
+
+
+def loopback_test(count=10000):
+    """Sends count packets over loopback and prints send-to-handler latency percentiles"""
+    latencies = []
+    done = threading.Event()
+
+    def handler(packet):
+        latencies.append(time.time() - packet.timestamp)
+        if len(latencies) == count:
+            done.set()
+
+    server = UdpControlServer(handler, host='127.0.0.1', port=0).start()
+    client = UdpControlClient(*server.address)
+    for i in range(count):
+        client.send(COMMANDS[i % len(COMMANDS)], 50)
+        if i % 100 == 99:
+            time.sleep(0.001)  # stay below the socket buffer
+    done.wait(5)
+    client.close()
+    server.close()
+
+    latencies.sort()
+    n = len(latencies)
+    print('received %d/%d, dropped %d' % (n, count, server.dropped))
+    for p in (50, 95, 99):
+        print('p%d: %.1f us' % (p, latencies[min(n - 1, n * p // 100)] * 1e6))
+
+
+if __name__ == '__main__':
+    loopback_test(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)